@@ -10,6 +10,11 @@ class Settings(BaseSettings):
     # Default: SQLite for local development (zero-configuration)
     # Production: Set DATABASE_URL in .env to use PostgreSQL
     database_url: str = "sqlite:///./data/construction.db"
+    # PostgreSQL connection pool. 0 keeps NullPool (one connection per request,
+    # safe for Supabase's client limit); >0 enables a QueuePool of that size.
+    db_pool_size: int = 0
+    db_max_overflow: int = 10
+    db_pool_recycle_seconds: int = 3600
 
     # JWT Settings
     secret_key: str = "your-secret-key-change-in-production"
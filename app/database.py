@@ -16,19 +16,32 @@ elif database_url.startswith("postgresql://"):
     database_url = database_url.replace("postgresql://", "postgresql+psycopg://", 1)
 
 # Pool configuration
-# PostgreSQL (Supabase): Use NullPool to avoid "max clients reached".
+# PostgreSQL (Supabase): Use NullPool by default to avoid "max clients reached".
 # Each request opens/closes its own connection. Slightly more latency
 # per request, but completely eliminates connection pool exhaustion.
+# Deployments with client headroom can set DB_POOL_SIZE to reuse connections.
 pool_settings = {}
 if not database_url.startswith("sqlite"):
-    pool_settings = {
-        "poolclass": NullPool,
-    }
+    if settings.db_pool_size > 0:
+        pool_settings = {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": 30,
+            "pool_recycle": settings.db_pool_recycle_seconds,
+            "pool_pre_ping": True,
+        }
+    else:
+        pool_settings = {
+            "poolclass": NullPool,
+        }
 
 engine = create_engine(
     database_url,
     connect_args=connect_args,
     echo=settings.debug,
+    # Statement compilation cache (default 500). The dashboard and list routes
+    # build many filter/aggregate shapes; a larger cache avoids evictions.
+    query_cache_size=1200,
     **pool_settings,
 )
 
@@ -454,6 +467,73 @@ def _run_migrations():
             pending.append(('ALTER TABLE contributions DROP COLUMN IF EXISTS receipt_file_path',
                             'Removed receipt_file_path from contributions'))
 
+    # --- Indexes for hot list/lookup queries ---
+    # Created after create_all(), so fresh installs and existing DBs both get them.
+    def get_index_names(table):
+        if table not in table_names:
+            return set()
+        return {ix['name'] for ix in inspector.get_indexes(table)}
+
+    contributions_ix = get_index_names('contributions')
+    contribution_payments_ix = get_index_names('contribution_payments')
+
+    if contributions_cols and 'idx_contributions_project_created' not in contributions_ix:
+        pending.append(('CREATE INDEX IF NOT EXISTS idx_contributions_project_created '
+                        'ON contributions (project_id, created_at DESC)',
+                        'Created idx_contributions_project_created'))
+    if contribution_payments_cols and 'idx_contribution_payments_user_contribution' not in contribution_payments_ix:
+        pending.append(('CREATE INDEX IF NOT EXISTS idx_contribution_payments_user_contribution '
+                        'ON contribution_payments (user_id, contribution_id)',
+                        'Created idx_contribution_payments_user_contribution'))
+    if contributions_cols and 'idx_contributions_project_status' not in contributions_ix:
+        pending.append(('CREATE INDEX IF NOT EXISTS idx_contributions_project_status '
+                        'ON contributions (project_id, status)',
+                        'Created idx_contributions_project_status'))
+    project_members_ix = get_index_names('project_members')
+    if members_cols and 'idx_project_members_project_active' not in project_members_ix:
+        pending.append(('CREATE INDEX IF NOT EXISTS idx_project_members_project_active '
+                        'ON project_members (project_id, is_active)',
+                        'Created idx_project_members_project_active'))
+
+    # The unpaid lookups are served by idx_contribution_payments_user_contribution;
+    # a partial index on the same keys only added write cost.
+    if 'idx_contribution_payments_unpaid' in contribution_payments_ix:
+        pending.append(('DROP INDEX IF EXISTS idx_contribution_payments_unpaid',
+                        'Dropped idx_contribution_payments_unpaid'))
+
+    # Partial indexes: pending/live rows are a small, hot slice of each table
+    participant_payments_ix = get_index_names('participant_payments')
+    expenses_ix = get_index_names('expenses')
+    if expenses_cols and 'idx_expenses_project_date_active' not in expenses_ix:
+        pending.append(('CREATE INDEX IF NOT EXISTS idx_expenses_project_date_active '
+                        'ON expenses (project_id, expense_date) WHERE is_deleted = FALSE',
+                        'Created idx_expenses_project_date_active'))
+    # Dashboard breakdowns group a project's live expenses by provider/category/rubro
+    for group_col in ('provider_id', 'category_id', 'rubro_id'):
+        index_name = f'idx_expenses_project_{group_col}_active'
+        if expenses_cols and index_name not in expenses_ix:
+            pending.append((f'CREATE INDEX IF NOT EXISTS {index_name} '
+                            f'ON expenses (project_id, {group_col}, expense_date) WHERE is_deleted = FALSE',
+                            f'Created {index_name}'))
+    if payments_cols and 'idx_participant_payments_pending_approval' not in participant_payments_ix:
+        pending.append(('CREATE INDEX IF NOT EXISTS idx_participant_payments_pending_approval '
+                        'ON participant_payments (expense_id, submitted_at) WHERE is_pending_approval = TRUE',
+                        'Created idx_participant_payments_pending_approval'))
+    if payments_cols and 'idx_participant_payments_user_active' not in participant_payments_ix:
+        pending.append(('CREATE INDEX IF NOT EXISTS idx_participant_payments_user_active '
+                        'ON participant_payments (user_id) WHERE is_deleted = FALSE',
+                        'Created idx_participant_payments_user_active'))
+    # Not partial: get_expense and update_expense_status filter on expense_id alone.
+    # It also serves the is_deleted = FALSE lookups, so it replaces the old partial
+    # idx_participant_payments_expense_active.
+    if payments_cols and 'idx_participant_payments_expense_flags' not in participant_payments_ix:
+        pending.append(('CREATE INDEX IF NOT EXISTS idx_participant_payments_expense_flags '
+                        'ON participant_payments (expense_id, is_deleted, is_paid, is_pending_approval)',
+                        'Created idx_participant_payments_expense_flags'))
+    if 'idx_participant_payments_expense_active' in participant_payments_ix:
+        pending.append(('DROP INDEX IF EXISTS idx_participant_payments_expense_active',
+                        'Dropped idx_participant_payments_expense_active'))
+
     # Execute all pending migrations
     if not pending:
         print("Migrations: All up to date (0 queries)")
@@ -49,7 +49,8 @@ class ConnectionCloseMiddleware(BaseHTTPMiddleware):
 
         # Force connection close to prevent zombie connections when Fly.io suspends
         response.headers["Connection"] = "close"
-        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+        # Default to no-store; routes that opt into caching set their own header
+        response.headers.setdefault("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0")
 
         logger.info(f"[{timestamp}] {request.method} {request.url.path} - Response: {response.status_code}")
         return response
@@ -3,7 +3,9 @@ from decimal import Decimal
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from fastapi.responses import FileResponse, Response, RedirectResponse
-from sqlalchemy.orm import Session, joinedload
+from pydantic import TypeAdapter
+from sqlalchemy import func, case, and_, insert
+from sqlalchemy.orm import Session, joinedload, aliased
 
 from app.database import get_db
 from app.schemas.contribution import (
@@ -19,7 +21,7 @@ from app.schemas.contribution import (
 )
 from app.models.contribution_absorption import ContributionAbsorption
 from app.schemas.payment import PaymentMarkPaid, PaymentApproval, AdminMarkContributionPaid
-from app.utils.dependencies import get_current_user, get_project_admin_user, get_project_from_header
+from app.utils.dependencies import get_current_user, get_project_admin_user, get_project_from_header, is_admin_member
 from app.models.user import User
 from app.models.contribution import Contribution, Currency, ContributionStatus
 from app.models.contribution_payment import ContributionPayment
@@ -28,9 +30,12 @@ from app.models.project_member import ProjectMember
 
 router = APIRouter(prefix="/contributions", tags=["Contributions"])
 
+# Built once at import; serializes the list straight to JSON bytes in pydantic-core
+_contribution_list_adapter = TypeAdapter(List[ContributionWithMyPayment])
+
 
 @router.get("", response_model=List[ContributionWithMyPayment])
-async def list_contributions(
+def list_contributions(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -44,8 +49,40 @@ async def list_contributions(
             detail="X-Project-ID header is required",
         )
 
-    contributions = (
-        db.query(Contribution)
+    # Paid/total counts per contribution, aggregated in SQL
+    payment_stats = (
+        db.query(
+            ContributionPayment.contribution_id.label("contribution_id"),
+            func.count(ContributionPayment.id).label("total"),
+            func.sum(case((ContributionPayment.is_paid == True, 1), else_=0)).label("paid"),
+        )
+        .join(Contribution, ContributionPayment.contribution_id == Contribution.id)
+        .filter(Contribution.project_id == project.id)
+        .group_by(ContributionPayment.contribution_id)
+        .subquery()
+    )
+    # Current user's payment per contribution. (contribution_id, user_id) is not
+    # unique, so pick the lowest id to keep one row per contribution.
+    my_payment_ids = (
+        db.query(
+            ContributionPayment.contribution_id.label("contribution_id"),
+            func.min(ContributionPayment.id).label("payment_id"),
+        )
+        .filter(ContributionPayment.user_id == current_user.id)
+        .group_by(ContributionPayment.contribution_id)
+        .subquery()
+    )
+    MyPayment = aliased(ContributionPayment)
+
+    rows = (
+        db.query(Contribution, MyPayment, payment_stats.c.total, payment_stats.c.paid)
+        .outerjoin(payment_stats, payment_stats.c.contribution_id == Contribution.id)
+        .outerjoin(my_payment_ids, my_payment_ids.c.contribution_id == Contribution.id)
+        .outerjoin(MyPayment, MyPayment.id == my_payment_ids.c.payment_id)
+        .options(
+            joinedload(Contribution.created_by_user),
+            joinedload(Contribution.contributor_user),
+        )
         .filter(Contribution.project_id == project.id)
         .order_by(Contribution.created_at.desc())
         .offset(skip)
@@ -53,15 +90,12 @@ async def list_contributions(
         .all()
     )
 
-    # Add payment stats and current user's payment info to each contribution
+    # Build response from the already-aggregated rows (no per-contribution queries)
     result = []
-    for contrib in contributions:
-        payments = db.query(ContributionPayment).filter(
-            ContributionPayment.contribution_id == contrib.id
-        ).all()
+    for contrib, my_payment, total_count, paid_count in rows:
+        total_count = total_count or 0
+        paid_count = int(paid_count or 0)
 
-        # Find current user's payment
-        my_payment = next((p for p in payments if p.user_id == current_user.id), None)
         my_payment_id = my_payment.id if my_payment else None
         my_amount_due = my_payment.amount_due if my_payment else Decimal("0")
 
@@ -71,38 +105,32 @@ async def list_contributions(
         if my_payment and not my_payment.is_paid and my_payment.submitted_at is not None:
             is_pending_approval = True
 
-        paid_count = sum(1 for p in payments if p.is_paid)
-        is_complete = paid_count == len(payments) if payments else False
-
-        # Contributor name for unilateral contributions
-        contributor_name = None
-        if contrib.is_unilateral and contrib.contributor_user:
-            contributor_name = contrib.contributor_user.full_name
+        is_complete = paid_count == total_count if total_count else False
 
         my_amount_offset = Decimal("0")
         if my_payment and hasattr(my_payment, 'amount_offset') and my_payment.amount_offset:
             my_amount_offset = my_payment.amount_offset
 
-        result.append(ContributionWithMyPayment(
-            **contrib.__dict__,
-            created_by_name=contrib.created_by_user.full_name,
-            created_by_email=contrib.created_by_user.email,
-            contributor_name=contributor_name,
+        # Contribution columns and creator/contributor names come straight from the
+        # ORM row (from_attributes); only the per-user fields are layered on top.
+        item = ContributionWithMyPayment.model_validate(contrib)
+        result.append(item.model_copy(update=dict(
             my_payment_id=my_payment_id,
             my_amount_due=my_amount_due,
             my_amount_offset=my_amount_offset,
             i_paid=i_paid,
             is_pending_approval=is_pending_approval,
             is_complete=is_complete,
-            total_participants=len(payments),
+            total_participants=total_count,
             paid_participants=paid_count,
-        ))
+        )))
 
-    return result
+    # Items are already validated; skip FastAPI's re-validation of the response_model
+    return Response(content=_contribution_list_adapter.dump_json(result), media_type="application/json")
 
 
 @router.get("/unilateral/unabsorbed", response_model=List[UnabsorbedContributionResponse])
-async def list_unabsorbed_unilateral(
+def list_unabsorbed_unilateral(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_project_admin_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -149,7 +177,7 @@ async def list_unabsorbed_unilateral(
 
 
 @router.get("/my-pending/count", response_model=dict)
-async def get_my_pending_contributions_count(
+def get_my_pending_contributions_count(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -176,14 +204,16 @@ async def get_my_pending_contributions_count(
 
 
 @router.get("/{contribution_id}", response_model=ContributionDetailResponse)
-async def get_contribution(
+def get_contribution(
     contribution_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
 ):
     """Get a specific contribution request with full participant payment details"""
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
+    contribution = db.get(
+        Contribution, contribution_id, options=[joinedload(Contribution.created_by_user)]
+    )
 
     if not contribution:
         raise HTTPException(status_code=404, detail="Contribution not found")
@@ -191,18 +221,17 @@ async def get_contribution(
     if project and contribution.project_id != project.id:
         raise HTTPException(status_code=403, detail="Contribution belongs to different project")
 
-    # Get all payments with user info
-    payments = db.query(ContributionPayment).filter(
-        ContributionPayment.contribution_id == contribution.id
-    ).all()
-    
-    # Force refresh to get latest receipt_file_path values
-    for payment in payments:
-        db.refresh(payment)
+    # All payments with their users in one query (fresh session, so no refresh needed)
+    rows = (
+        db.query(ContributionPayment, User)
+        .outerjoin(User, ContributionPayment.user_id == User.id)
+        .filter(ContributionPayment.contribution_id == contribution.id)
+        .all()
+    )
+    payments = [payment for payment, _ in rows]
 
     payment_details = []
-    for payment in payments:
-        user = payment.user
+    for payment, user in rows:
         offset = Decimal(str(payment.amount_offset)) if payment.amount_offset else Decimal("0")
         remaining = Decimal(str(payment.amount_due)) - offset
         # Determine if payment is pending approval (submitted but not yet approved)
@@ -226,8 +255,10 @@ async def get_contribution(
     paid_count = sum(1 for p in payments if p.is_paid)
     is_complete = paid_count == len(payments) if payments else False
 
+    # Column fields via the base response model, instead of spreading the ORM
+    # instance's __dict__ (instance state, loaded relationships, ...)
     return ContributionDetailResponse(
-        **contribution.__dict__,
+        **ContributionResponse.model_validate(contribution).model_dump(),
         created_by_name=contribution.created_by_user.full_name,
         created_by_email=contribution.created_by_user.email,
         payments=payment_details,
@@ -238,7 +269,7 @@ async def get_contribution(
 
 
 @router.post("", response_model=ContributionResponse, status_code=status.HTTP_201_CREATED)
-async def create_contribution(
+def create_contribution(
     contribution_data: ContributionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_project_admin_user),
@@ -263,28 +294,32 @@ async def create_contribution(
     db.add(contribution)
     db.flush()  # Get the ID
 
-    # Create contribution payments (split among all active members)
-    members = db.query(ProjectMember).filter(
+    # Build contribution payment rows (split among all active members).
+    # Only the two columns needed for the split are loaded.
+    members = db.query(ProjectMember.user_id, ProjectMember.participation_percentage).filter(
         ProjectMember.project_id == project.id,
         ProjectMember.is_active == True
     ).all()
 
-    payments_by_user = {}
-    for member in members:
-        percentage = member.participation_percentage / Decimal(100)
-        amount_due = (contribution_data.amount * percentage).quantize(Decimal("0.01"))
-
-        payment = ContributionPayment(
-            contribution_id=contribution.id,
-            user_id=member.user_id,
-            amount_due=amount_due,
-            is_paid=False,
-        )
-        db.add(payment)
-        db.flush()
-        payments_by_user[member.user_id] = payment
+    # Hoist the Decimal operands out of the split so the loop allocates only the results
+    hundred = Decimal(100)
+    cents = Decimal("0.01")
+    zero = Decimal("0")
+    amount = contribution_data.amount
+    contribution_id = contribution.id
+
+    payments_by_user = {
+        user_id: {
+            "contribution_id": contribution_id,
+            "user_id": user_id,
+            "amount_due": (amount * participation_percentage / hundred).quantize(cents),
+            "amount_offset": zero,
+            "is_paid": False,
+        }
+        for user_id, participation_percentage in members
+    }
 
-    # Absorb unilateral contributions if specified
+    # Absorb unilateral contributions if specified (applied to the rows before insert)
     if contribution_data.absorb_unilateral_ids:
         now = datetime.utcnow()
         for unilateral_id in contribution_data.absorb_unilateral_ids:
@@ -310,8 +345,8 @@ async def create_contribution(
             if remaining <= 0:
                 continue
 
-            current_offset = Decimal(str(user_payment.amount_offset or 0))
-            available_to_offset = Decimal(str(user_payment.amount_due)) - current_offset
+            current_offset = user_payment["amount_offset"]
+            available_to_offset = user_payment["amount_due"] - current_offset
             if available_to_offset <= 0:
                 continue
 
@@ -332,24 +367,31 @@ async def create_contribution(
 
             # Update absorbed_amount and payment offset (both in the same currency)
             unilateral.absorbed_amount = Decimal(str(unilateral.absorbed_amount)) + absorption
-            user_payment.amount_offset = current_offset + absorption
+            user_payment["amount_offset"] = current_offset + absorption
 
             # If fully covered, auto-mark as paid (WITHOUT crediting balance — already credited with unilateral)
-            if user_payment.amount_offset >= Decimal(str(user_payment.amount_due)):
-                user_payment.is_paid = True
-                user_payment.paid_at = now
-                user_payment.payment_date = now
-                user_payment.submitted_at = now
-                user_payment.approved_at = now
-                user_payment.approved_by = current_user.id
-                user_payment.amount_paid = user_payment.amount_due
-                user_payment.currency_paid = contribution_data.currency.value
+            if user_payment["amount_offset"] >= user_payment["amount_due"]:
+                amount_due = user_payment["amount_due"]
+                user_payment.update(
+                    is_paid=True,
+                    paid_at=now,
+                    payment_date=now,
+                    submitted_at=now,
+                    approved_at=now,
+                    approved_by=current_user.id,
+                    amount_paid=amount_due,
+                    currency_paid=contribution_data.currency.value,
+                )
                 if contribution_data.currency.value == "USD":
-                    user_payment.amount_paid_usd = user_payment.amount_due
-                    user_payment.amount_paid_ars = Decimal("0")
+                    user_payment["amount_paid_usd"] = amount_due
+                    user_payment["amount_paid_ars"] = Decimal("0")
                 else:
-                    user_payment.amount_paid_ars = user_payment.amount_due
-                    user_payment.amount_paid_usd = Decimal("0")
+                    user_payment["amount_paid_ars"] = amount_due
+                    user_payment["amount_paid_usd"] = Decimal("0")
+
+    # Single bulk INSERT for all payment rows instead of one per member
+    if payments_by_user:
+        db.execute(insert(ContributionPayment), list(payments_by_user.values()))
 
     db.commit()
     db.refresh(contribution)
@@ -358,7 +400,7 @@ async def create_contribution(
 
 
 @router.post("/unilateral", response_model=ContributionResponse, status_code=status.HTTP_201_CREATED)
-async def create_unilateral_contribution(
+def create_unilateral_contribution(
     data: UnilateralContributionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -393,14 +435,16 @@ async def create_unilateral_contribution(
         )
 
     # Check no pending contribution payments for this user (formal requests)
-    pending_formal = db.query(ContributionPayment).join(Contribution).filter(
-        Contribution.project_id == project.id,
-        Contribution.is_unilateral == False,
-        Contribution.is_adjustment == False,
-        ContributionPayment.user_id == current_user.id,
-        ContributionPayment.is_paid == False,
-    ).first()
-    if pending_formal:
+    has_pending_formal = db.query(
+        db.query(ContributionPayment).join(Contribution).filter(
+            Contribution.project_id == project.id,
+            Contribution.is_unilateral == False,
+            Contribution.is_adjustment == False,
+            ContributionPayment.user_id == current_user.id,
+            ContributionPayment.is_paid == False,
+        ).exists()
+    ).scalar()
+    if has_pending_formal:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Tenés aportes pendientes de solicitudes formales. Pagá primero esos aportes.",
@@ -467,7 +511,7 @@ async def create_unilateral_contribution(
 
 
 @router.post("/adjust-balance", response_model=ContributionResponse, status_code=status.HTTP_201_CREATED)
-async def create_balance_adjustment(
+def create_balance_adjustment(
     adjustment_data: BalanceAdjustmentCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_project_admin_user),
@@ -546,7 +590,7 @@ async def create_balance_adjustment(
 
 
 @router.put("/payments/{payment_id}/submit", status_code=status.HTTP_200_OK)
-async def submit_contribution_payment(
+def submit_contribution_payment(
     payment_id: int,
     payment_data: PaymentMarkPaid,
     db: Session = Depends(get_db),
@@ -559,16 +603,28 @@ async def submit_contribution_payment(
     Otherwise, marks as pending approval.
     """
     from datetime import datetime
-    from app.utils.dependencies import is_project_admin
 
-    payment = db.query(ContributionPayment).filter(ContributionPayment.id == payment_id).first()
+    # Payment, its contribution, the project and the caller's membership in one round-trip
+    row = (
+        db.query(ContributionPayment, Contribution, Project, ProjectMember)
+        .join(Contribution, ContributionPayment.contribution_id == Contribution.id)
+        .join(Project, Contribution.project_id == Project.id)
+        .outerjoin(ProjectMember, and_(
+            ProjectMember.project_id == Contribution.project_id,
+            ProjectMember.user_id == current_user.id,
+        ))
+        .filter(ContributionPayment.id == payment_id)
+        .first()
+    )
 
-    if not payment:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contribution payment not found",
         )
 
+    payment, contribution, project_obj, member = row
+
     # Check access - only own payments
     if payment.user_id != current_user.id:
         raise HTTPException(
@@ -582,17 +638,8 @@ async def submit_contribution_payment(
             detail="Payment is already approved and paid",
         )
 
-    # Get contribution and project to check if individual or user is admin
-    contribution = db.query(Contribution).filter(Contribution.id == payment.contribution_id).first()
-    if not contribution:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Contribution not found",
-        )
-
-    project_obj = db.query(Project).filter(Project.id == contribution.project_id).first()
-    is_individual = project_obj.is_individual if project_obj else False
-    user_is_admin = is_project_admin(db, current_user.id, contribution.project_id)
+    is_individual = project_obj.is_individual
+    user_is_admin = is_admin_member(member)
     currency_mode = getattr(project_obj, 'currency_mode', 'DUAL') or 'DUAL'
 
     # Update payment info
@@ -643,11 +690,6 @@ async def submit_contribution_payment(
         payment.exchange_rate_source = None
 
     # Auto-approve for individual projects OR if user is admin
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == contribution.project_id,
-        ProjectMember.user_id == current_user.id,
-    ).first()
-
     if is_individual or user_is_admin:
         payment.is_paid = True
         payment.paid_at = datetime.utcnow()
@@ -775,7 +817,9 @@ async def upload_contribution_receipt(
     """Upload receipt for a contribution payment"""
     from app.services.file_storage import save_receipt
 
-    payment = db.query(ContributionPayment).filter(ContributionPayment.id == payment_id).first()
+    # Lock the payment row so concurrent uploads for the same payment serialize
+    # instead of racing on receipt_file_path (no-op on SQLite).
+    payment = db.get(ContributionPayment, payment_id, with_for_update=True)
 
     if not payment:
         raise HTTPException(
@@ -790,7 +834,8 @@ async def upload_contribution_receipt(
             detail="Not authorized to upload receipt for this payment",
         )
 
-    # Save receipt file
+    # Save receipt file. If storage fails nothing has been written to the row,
+    # and get_db's close() rolls back the transaction and releases the lock.
     file_path = await save_receipt(file, payment_id)
     payment.receipt_file_path = file_path
 
@@ -800,7 +845,7 @@ async def upload_contribution_receipt(
 
 
 @router.get("/payments/{payment_id}/receipt")
-async def download_contribution_receipt(
+def download_contribution_receipt(
     payment_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -808,16 +853,34 @@ async def download_contribution_receipt(
     """Download receipt for a contribution payment"""
     from app.services.file_storage import get_file_path, get_file_url
 
-    payment = db.query(ContributionPayment).filter(ContributionPayment.id == payment_id).first()
+    # Payment and the caller's membership in its project, in one query
+    row = (
+        db.query(ContributionPayment, ProjectMember)
+        .join(Contribution, ContributionPayment.contribution_id == Contribution.id)
+        .outerjoin(
+            ProjectMember,
+            and_(
+                ProjectMember.project_id == Contribution.project_id,
+                ProjectMember.user_id == current_user.id,
+            ),
+        )
+        .filter(ContributionPayment.id == payment_id)
+        .first()
+    )
 
-    if not payment:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contribution payment not found",
         )
-    
-    # Force refresh to get latest receipt_file_path
-    db.refresh(payment)
+    payment, member = row
+
+    # Any active project member can see receipts (ContributionDetail lists them all)
+    if not member or not member.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this receipt",
+        )
 
     if not payment.receipt_file_path:
         raise HTTPException(
@@ -825,10 +888,11 @@ async def download_contribution_receipt(
             detail="No receipt found for this payment",
         )
 
-    # Cloudinary URL — redirect directly to avoid 401 proxy issues
+    # Cloudinary URL — redirect directly to avoid 401 proxy issues.
+    # A re-upload stores a new URL, so a short private cache of the redirect is safe.
     file_url = get_file_url(payment.receipt_file_path)
     if file_url:
-        return RedirectResponse(url=file_url)
+        return RedirectResponse(url=file_url, headers={"Cache-Control": "private, max-age=300"})
 
     # Local file
     file_path = get_file_path(payment.receipt_file_path)
@@ -856,7 +920,7 @@ async def download_contribution_receipt(
 
 
 @router.put("/payments/{payment_id}/approve", status_code=status.HTTP_200_OK)
-async def approve_contribution_payment(
+def approve_contribution_payment(
     payment_id: int,
     approval: PaymentApproval,
     db: Session = Depends(get_db),
@@ -868,7 +932,7 @@ async def approve_contribution_payment(
     from datetime import datetime
     from app.utils.dependencies import is_project_admin
 
-    payment = db.query(ContributionPayment).filter(ContributionPayment.id == payment_id).first()
+    payment = db.get(ContributionPayment, payment_id)
 
     if not payment:
         raise HTTPException(
@@ -877,7 +941,7 @@ async def approve_contribution_payment(
         )
 
     # Get contribution and verify user is admin of the project
-    contribution = db.query(Contribution).filter(Contribution.id == payment.contribution_id).first()
+    contribution = db.get(Contribution, payment.contribution_id)
     if not contribution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -913,7 +977,7 @@ async def approve_contribution_payment(
         ).first()
 
         if member:
-            project = db.query(Project).filter(Project.id == contribution.project_id).first()
+            project = db.get(Project, contribution.project_id)
             currency_mode = getattr(project, 'currency_mode', 'DUAL') or 'DUAL'
 
             # Credit balance according to currency_mode
@@ -947,7 +1011,7 @@ async def approve_contribution_payment(
 
 
 @router.put("/payments/{payment_id}/mark-paid", status_code=status.HTTP_200_OK)
-async def admin_mark_contribution_paid(
+def admin_mark_contribution_paid(
     payment_id: int,
     data: AdminMarkContributionPaid,
     db: Session = Depends(get_db),
@@ -961,7 +1025,7 @@ async def admin_mark_contribution_paid(
     from app.utils.dependencies import is_project_admin
     from app.services.exchange_rate import fetch_blue_dollar_rate_sync
 
-    payment = db.query(ContributionPayment).filter(ContributionPayment.id == payment_id).first()
+    payment = db.get(ContributionPayment, payment_id)
 
     if not payment:
         raise HTTPException(
@@ -970,7 +1034,7 @@ async def admin_mark_contribution_paid(
         )
 
     # Get contribution and verify user is admin of the project
-    contribution = db.query(Contribution).filter(Contribution.id == payment.contribution_id).first()
+    contribution = db.get(Contribution, payment.contribution_id)
     if not contribution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -990,7 +1054,7 @@ async def admin_mark_contribution_paid(
             detail="Payment is already marked as paid",
         )
 
-    project = db.query(Project).filter(Project.id == contribution.project_id).first()
+    project = db.get(Project, contribution.project_id)
     currency_mode = getattr(project, 'currency_mode', 'DUAL') or 'DUAL'
 
     # Determine amount to use
@@ -1073,7 +1137,7 @@ async def admin_mark_contribution_paid(
 
 
 @router.delete("/{contribution_id}", status_code=status.HTTP_200_OK)
-async def delete_contribution(
+def delete_contribution(
     contribution_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_project_admin_user),
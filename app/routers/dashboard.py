@@ -1,10 +1,14 @@
+import asyncio
+from functools import lru_cache
 from decimal import Decimal
 from typing import List, Optional
-from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session, joinedload, contains_eager
-from sqlalchemy import func, extract
-from io import BytesIO
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, joinedload, contains_eager, load_only, raiseload
+from sqlalchemy import func, extract, case, literal
+import tempfile
 from datetime import datetime
 
 from app.database import get_db
@@ -18,6 +22,7 @@ from app.schemas.dashboard import (
     ExpenseByProvider,
     ExpenseByCategory,
     ExpenseByRubro,
+    ExpensesBreakdown,
 )
 from app.schemas.contribution import MemberBalanceResponse, ContributionsByParticipant
 from app.utils.dependencies import get_current_user, get_project_from_header
@@ -26,18 +31,45 @@ from app.models.expense import Expense
 from app.models.payment import ParticipantPayment
 from app.models.project import Project
 from app.models.project_member import ProjectMember
-from app.models.contribution import Contribution, ContributionStatus
+from app.models.contribution import Contribution, ContributionStatus, Currency
+from app.models.contribution_payment import ContributionPayment
+from app.models.provider import Provider
+from app.models.category import Category
+from app.models.rubro import Rubro
 from app.services.exchange_rate import fetch_blue_dollar_rate
-from app.services.expense_splitter import get_user_payment_summary
+from app.services.expense_splitter import get_user_payment_summary, get_payment_summaries_for_users
 from app.services.contribution_manager import get_all_member_balances, get_contributions_by_participant
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+# Built once at import; the list endpoints build their items with model_construct
+# from already-typed query results and serialize them straight to JSON bytes in
+# pydantic-core, instead of validating each item twice (constructor + response_model)
+_user_status_list_adapter = TypeAdapter(List[UserPaymentStatus])
+_provider_list_adapter = TypeAdapter(List[ExpenseByProvider])
+_category_list_adapter = TypeAdapter(List[ExpenseByCategory])
+_rubro_list_adapter = TypeAdapter(List[ExpenseByRubro])
+_balance_list_adapter = TypeAdapter(List[MemberBalanceResponse])
+_contributions_list_adapter = TypeAdapter(List[ContributionsByParticipant])
+
+# Read size when streaming the generated workbook back to the client
+EXPORT_CHUNK_SIZE = 64 * 1024
+# Expenses fetched per batch when streaming them into the Excel export
+EXPORT_EXPENSE_BATCH_SIZE = 500
+# Excel export number formats and column widths (by column letter)
+EXPORT_CURRENCY_FORMAT = '"$"#,##0.00'
+EXPORT_DATE_FORMAT = "DD/MM/YYYY"
+EXPORT_EXPENSE_COLUMN_WIDTH = 15
+EXPORT_SUMMARY_COLUMN_WIDTHS = {"A": 25, "B": 20}
+EXPORT_PARTICIPANT_COLUMN_WIDTHS = {"A": 25, "B": 30, "C": 18, "D": 18, "E": 18, "F": 18}
+# Fecha, Tipo, Descripción, Ingreso, Egreso, Saldo
+EXPORT_ESTADO_COLUMN_WIDTHS = {"A": 14, "B": 20, "C": 50, "D": 22, "E": 22, "F": 22}
+
 
 @router.get("/summary", response_model=DashboardSummary)
 async def get_dashboard_summary(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -46,95 +78,144 @@ async def get_dashboard_summary(
     Get overall dashboard summary with totals for the current project.
     Optionally filter by date range (expense_date).
     """
-    # Build expense query (exclude deleted expenses)
-    expense_query = db.query(
-        func.sum(Expense.amount_usd).label("total_usd"),
-        func.sum(Expense.amount_ars).label("total_ars"),
-        func.count(Expense.id).label("count"),
-    ).filter(Expense.is_deleted == False)
-    if project:
-        expense_query = expense_query.filter(Expense.project_id == project.id)
-
-    # Date filters
-    if start_date:
-        expense_query = expense_query.filter(Expense.expense_date >= datetime.fromisoformat(start_date))
-    if end_date:
-        expense_query = expense_query.filter(Expense.expense_date <= datetime.fromisoformat(end_date))
-
-    expense_totals = expense_query.first()
-
-    total_expenses_usd = Decimal(str(expense_totals.total_usd or 0))
-    total_expenses_ars = Decimal(str(expense_totals.total_ars or 0))
-    expenses_count = expense_totals.count or 0
-
-    # Get payment totals (filter by project through expense, exclude deleted)
-    # Only count expense payments, not contribution payments
-    paid_query = db.query(
-        func.sum(ParticipantPayment.amount_due_usd).label("paid_usd"),
-        func.sum(ParticipantPayment.amount_due_ars).label("paid_ars"),
-    ).join(Expense).filter(
-        ParticipantPayment.expense_id.isnot(None),  # Only expense payments
-        ParticipantPayment.is_paid == True,
-        ParticipantPayment.is_deleted == False,
-        Expense.is_deleted == False,
-    )
-
-    if project:
-        paid_query = paid_query.filter(Expense.project_id == project.id)
-
-    # Date filters on payments
-    if start_date:
-        paid_query = paid_query.filter(Expense.expense_date >= datetime.fromisoformat(start_date))
-    if end_date:
-        paid_query = paid_query.filter(Expense.expense_date <= datetime.fromisoformat(end_date))
+    # Get currency_mode and project type from project
+    project_id = project.id if project else None
+    currency_mode = (project.currency_mode if project else None) or "DUAL"
+    project_type = project.project_type if project else None
+
+    # Start the exchange rate fetch (skip for single-currency projects) so the
+    # HTTP call overlaps with the totals query below
+    rate_task = asyncio.create_task(fetch_blue_dollar_rate()) if currency_mode == "DUAL" else None
+
+    try:
+        # Date filters, applied to both the expense and payment totals
+        date_filters = []
+        if start_date:
+            date_filters.append(Expense.expense_date >= start_date)
+        if end_date:
+            date_filters.append(Expense.expense_date <= end_date)
+
+        # Expense totals, paid/pending dues and participant count are built as
+        # single-row subqueries and read back in one round-trip.
+        expense_query = db.query(
+            func.sum(Expense.amount_usd).label("total_usd"),
+            func.sum(Expense.amount_ars).label("total_ars"),
+            func.count(Expense.id).label("count"),
+        ).filter(Expense.is_deleted == False, *date_filters)
+        if project:
+            expense_query = expense_query.filter(Expense.project_id == project_id)
+
+        # Paid and pending expense dues (filter by project through expense, exclude deleted).
+        # Pending is a direct sum of unpaid dues (avoids rounding drift).
+        # Only count expense payments, not contribution payments
+        is_paid = ParticipantPayment.is_paid == True
+        is_unpaid = ParticipantPayment.is_paid == False
+        payment_query = db.query(
+            func.sum(case((is_paid, ParticipantPayment.amount_due_usd))).label("paid_usd"),
+            func.sum(case((is_paid, ParticipantPayment.amount_due_ars))).label("paid_ars"),
+            func.sum(case((is_unpaid, ParticipantPayment.amount_due_usd))).label("pending_usd"),
+            func.sum(case((is_unpaid, ParticipantPayment.amount_due_ars))).label("pending_ars"),
+        ).join(Expense).filter(
+            ParticipantPayment.expense_id.isnot(None),  # Only expense payments
+            ParticipantPayment.is_deleted == False,
+            Expense.is_deleted == False,
+            *date_filters,
+        )
 
-    paid_payments = paid_query.first()
+        if project:
+            payment_query = payment_query.filter(Expense.project_id == project_id)
+
+        # Participant count
+        if project:
+            participants_query = (
+                db.query(func.count(ProjectMember.id))
+                .join(User)
+                .filter(ProjectMember.project_id == project_id)
+                .filter(ProjectMember.is_active == True)
+                .filter(User.is_active == True)
+                .filter(ProjectMember.participation_percentage > 0)
+            )
+        else:
+            participants_query = (
+                db.query(func.count(User.id))
+                .filter(User.is_active == True)
+            )
 
-    total_paid_usd = Decimal(str(paid_payments.paid_usd or 0))
-    total_paid_ars = Decimal(str(paid_payments.paid_ars or 0))
+        expense_sq = expense_query.subquery()
+        payment_sq = payment_query.subquery()
+        totals_query = db.query(
+            expense_sq.c.total_usd,
+            expense_sq.c.total_ars,
+            expense_sq.c.count,
+            payment_sq.c.paid_usd,
+            payment_sq.c.paid_ars,
+            payment_sq.c.pending_usd,
+            payment_sq.c.pending_ars,
+            participants_query.scalar_subquery().label("participants_count"),
+        ).select_from(expense_sq).join(payment_sq, literal(True))
+        totals = await run_in_threadpool(totals_query.first)
+
+        # Approved contribution totals and member balances, read together in one
+        # round-trip (also before waiting on the exchange rate)
+        project_totals = None
+        if project:
+            # Sum based on currency field (Contribution uses generic amount + currency)
+            contributions_sq = db.query(
+                func.sum(case(
+                    (Contribution.currency == Currency.USD, Contribution.amount),
+                    else_=0
+                )).label("total_usd"),
+                func.sum(case(
+                    (Contribution.currency == Currency.ARS, Contribution.amount),
+                    else_=0
+                )).label("total_ars"),
+            ).filter(
+                Contribution.project_id == project_id,
+                Contribution.status == ContributionStatus.APPROVED,
+            ).subquery()
+            balances_sq = db.query(
+                func.sum(ProjectMember.balance_usd).label("balance_usd"),
+                func.sum(ProjectMember.balance_ars).label("balance_ars"),
+            ).filter(
+                ProjectMember.project_id == project_id,
+                ProjectMember.is_active == True,
+            ).subquery()
+            project_totals_query = db.query(
+                contributions_sq.c.total_usd.label("contributions_usd"),
+                contributions_sq.c.total_ars.label("contributions_ars"),
+                balances_sq.c.balance_usd,
+                balances_sq.c.balance_ars,
+            ).select_from(contributions_sq).join(balances_sq, literal(True))
+            project_totals = await run_in_threadpool(project_totals_query.first)
+
+        # Get current exchange rate (skip for single-currency projects)
+        if rate_task:
+            try:
+                current_rate = await rate_task
+            except Exception:
+                current_rate = Decimal("0")
+        else:
+            current_rate = Decimal("0")
+    finally:
+        # If a query above raised, the rate was never awaited: stop the fetch (or
+        # retrieve its error) so it is not left running unobserved
+        if rate_task:
+            if not rate_task.done():
+                rate_task.cancel()
+            elif not rate_task.cancelled():
+                rate_task.exception()
 
-    # Calculate pending as direct sum of unpaid dues (avoids rounding drift)
-    pending_query = db.query(
-        func.sum(ParticipantPayment.amount_due_usd).label("pending_usd"),
-        func.sum(ParticipantPayment.amount_due_ars).label("pending_ars"),
-    ).join(Expense).filter(
-        ParticipantPayment.expense_id.isnot(None),
-        ParticipantPayment.is_paid == False,
-        ParticipantPayment.is_deleted == False,
-        Expense.is_deleted == False,
-    )
-    if project:
-        pending_query = pending_query.filter(Expense.project_id == project.id)
-    if start_date:
-        pending_query = pending_query.filter(Expense.expense_date >= datetime.fromisoformat(start_date))
-    if end_date:
-        pending_query = pending_query.filter(Expense.expense_date <= datetime.fromisoformat(end_date))
+    total_expenses_usd = totals.total_usd or Decimal("0")
+    total_expenses_ars = totals.total_ars or Decimal("0")
+    expenses_count = totals.count or 0
 
-    pending_result = pending_query.first()
-    total_pending_usd = Decimal(str(pending_result.pending_usd or 0))
-    total_pending_ars = Decimal(str(pending_result.pending_ars or 0))
+    total_paid_usd = totals.paid_usd or Decimal("0")
+    total_paid_ars = totals.paid_ars or Decimal("0")
 
-    # Get participant count
-    if project:
-        participants_count = (
-            db.query(ProjectMember)
-            .join(User)
-            .filter(ProjectMember.project_id == project.id)
-            .filter(ProjectMember.is_active == True)
-            .filter(User.is_active == True)
-            .filter(ProjectMember.participation_percentage > 0)
-            .count()
-        )
-    else:
-        participants_count = (
-            db.query(User)
-            .filter(User.is_active == True)
-            .count()
-        )
+    total_pending_usd = totals.pending_usd or Decimal("0")
+    total_pending_ars = totals.pending_ars or Decimal("0")
 
-    # Get currency_mode and project type from project
-    currency_mode = getattr(project, 'currency_mode', None) or "DUAL" if project else "DUAL"
-    project_type = getattr(project, 'project_type', None) if project else None
+    participants_count = totals.participants_count or 0
 
     # Extract square_meters and contribution_mode from type_parameters JSON
     square_meters = None
@@ -143,9 +224,10 @@ async def get_dashboard_summary(
     land_purchase_amount = None
     land_purchase_currency = None
     land_purchase_exchange_rate = None
-    if project and project_type and project_type == "construccion":
-        type_params = getattr(project, 'type_parameters', None)
-        if type_params and isinstance(type_params, dict):
+    if project_type == "construccion":
+        # type_parameters is validated as a dict by the project schemas
+        type_params = project.type_parameters
+        if type_params:
             square_meters = type_params.get('square_meters')
             if square_meters:
                 square_meters = Decimal(str(square_meters))
@@ -159,57 +241,24 @@ async def get_dashboard_summary(
             if land_purchase_exchange_rate:
                 land_purchase_exchange_rate = Decimal(str(land_purchase_exchange_rate))
 
-    # Get current exchange rate (skip for single-currency projects)
-    if currency_mode == "DUAL":
-        try:
-            current_rate = await fetch_blue_dollar_rate()
-        except Exception:
-            current_rate = Decimal("0")
-    else:
-        current_rate = Decimal("0")
-
     # Get contribution totals (approved only)
     total_contributions_usd = Decimal("0")
     total_contributions_ars = Decimal("0")
     total_balance_usd = Decimal("0")
     total_balance_ars = Decimal("0")
 
-    if project:
-        # Get total approved contributions
-        # Sum based on currency field (Contribution uses generic amount + currency)
-        from app.models.contribution import Currency as ContribCurrency
-        from sqlalchemy import case
-
-        contributions_query = db.query(
-            func.sum(case(
-                (Contribution.currency == ContribCurrency.USD, Contribution.amount),
-                else_=0
-            )).label("total_usd"),
-            func.sum(case(
-                (Contribution.currency == ContribCurrency.ARS, Contribution.amount),
-                else_=0
-            )).label("total_ars"),
-        ).filter(
-            Contribution.project_id == project.id,
-            Contribution.status == ContributionStatus.APPROVED,
-        )
-        contributions_totals = contributions_query.first()
-        total_contributions_usd = Decimal(str(contributions_totals.total_usd or 0))
-        total_contributions_ars = Decimal(str(contributions_totals.total_ars or 0))
-
-        # Get total member balances
-        members_balances = db.query(ProjectMember).filter(
-            ProjectMember.project_id == project.id,
-            ProjectMember.is_active == True,
-        ).all()
+    if project_totals:
+        total_contributions_usd = project_totals.contributions_usd or Decimal("0")
+        total_contributions_ars = project_totals.contributions_ars or Decimal("0")
 
         # Sum up balances (for DUAL mode, calculate USD equivalent in real-time)
+        # (None check rather than `or`, which would turn Decimal("0.00") into "0")
+        if project_totals.balance_ars is not None:
+            total_balance_ars = project_totals.balance_ars
         if currency_mode == "DUAL" and current_rate > 0:
-            total_balance_ars = sum(Decimal(str(m.balance_ars)) for m in members_balances)
             total_balance_usd = (total_balance_ars / current_rate).quantize(Decimal("0.01"))
-        else:
-            total_balance_usd = sum(Decimal(str(m.balance_usd)) for m in members_balances)
-            total_balance_ars = sum(Decimal(str(m.balance_ars)) for m in members_balances)
+        elif project_totals.balance_usd is not None:
+            total_balance_usd = project_totals.balance_usd
 
     # Calculate land purchase cost in both currencies based on project currency mode
     land_purchase_usd = Decimal("0")
@@ -292,9 +341,9 @@ async def get_dashboard_summary(
 
 
 @router.get("/evolution", response_model=ExpenseEvolution)
-async def get_expense_evolution(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+def get_expense_evolution(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -303,13 +352,18 @@ async def get_expense_evolution(
     Get monthly expense evolution for the current project.
     Optionally filter by date range (expense_date).
     """
-    # Group expenses by year and month (exclude deleted)
+    # Group expenses by year and month (exclude deleted); running totals are
+    # computed by the database as window sums over the monthly groups
+    year_col = extract("year", Expense.expense_date)
+    month_col = extract("month", Expense.expense_date)
     query = db.query(
-        extract("year", Expense.expense_date).label("year"),
-        extract("month", Expense.expense_date).label("month"),
-        func.sum(Expense.amount_usd).label("total_usd"),
-        func.sum(Expense.amount_ars).label("total_ars"),
+        year_col.label("year"),
+        month_col.label("month"),
+        func.coalesce(func.sum(Expense.amount_usd), 0).label("total_usd"),
+        func.coalesce(func.sum(Expense.amount_ars), 0).label("total_ars"),
         func.count(Expense.id).label("count"),
+        func.sum(func.sum(Expense.amount_usd)).over(order_by=[year_col, month_col]).label("cumulative_usd"),
+        func.sum(func.sum(Expense.amount_ars)).over(order_by=[year_col, month_col]).label("cumulative_ars"),
     ).filter(Expense.is_deleted == False)
 
     if project:
@@ -317,40 +371,34 @@ async def get_expense_evolution(
 
     # Date filters
     if start_date:
-        query = query.filter(Expense.expense_date >= datetime.fromisoformat(start_date))
+        query = query.filter(Expense.expense_date >= start_date)
     if end_date:
-        query = query.filter(Expense.expense_date <= datetime.fromisoformat(end_date))
+        query = query.filter(Expense.expense_date <= end_date)
 
     monthly_data = (
         query
-        .group_by(
-            extract("year", Expense.expense_date),
-            extract("month", Expense.expense_date),
-        )
-        .order_by(
-            extract("year", Expense.expense_date),
-            extract("month", Expense.expense_date),
-        )
+        .group_by(year_col, month_col)
+        .order_by(year_col, month_col)
         .all()
     )
 
-    monthly_expenses = []
-    cumulative_usd = Decimal("0")
-    cumulative_ars = Decimal("0")
-
-    for row in monthly_data:
-        monthly_usd = Decimal(str(row.total_usd or 0))
-        monthly_ars = Decimal(str(row.total_ars or 0))
-        cumulative_usd += monthly_usd
-        cumulative_ars += monthly_ars
-
-        monthly_expenses.append(MonthlyExpense(
+    monthly_expenses = [
+        MonthlyExpense(
             year=int(row.year),
             month=int(row.month),
-            total_usd=monthly_usd,
-            total_ars=monthly_ars,
+            total_usd=row.total_usd,
+            total_ars=row.total_ars,
             expenses_count=row.count,
-        ))
+        )
+        for row in monthly_data
+    ]
+
+    # The last month's running total is the cumulative total
+    cumulative_usd = Decimal("0")
+    cumulative_ars = Decimal("0")
+    if monthly_data:
+        cumulative_usd = monthly_data[-1].cumulative_usd or Decimal("0")
+        cumulative_ars = monthly_data[-1].cumulative_ars or Decimal("0")
 
     return ExpenseEvolution(
         monthly_data=monthly_expenses,
@@ -378,35 +426,37 @@ async def get_my_payment_status(
     has_pending_contribution = False
 
     if project:
-        currency_mode = getattr(project, 'currency_mode', 'DUAL') or 'DUAL'
+        currency_mode = project.currency_mode or "DUAL"
         member = (
             db.query(ProjectMember)
-            .filter(ProjectMember.project_id == project.id)
+            .options(load_only(
+                ProjectMember.participation_percentage,
+                ProjectMember.balance_usd,
+                ProjectMember.balance_ars,
+            ))
+            .filter(ProjectMember.project_id == project_id)
             .filter(ProjectMember.user_id == current_user.id)
             .first()
         )
         if member:
-            participation_percentage = Decimal(str(member.participation_percentage))
-            balance_aportes_ars = Decimal(str(member.balance_ars))
+            participation_percentage = member.participation_percentage
+            balance_aportes_ars = member.balance_ars
 
             if currency_mode == "USD":
-                balance_aportes_usd = Decimal(str(member.balance_usd))
+                balance_aportes_usd = member.balance_usd
                 balance_aportes_ars = Decimal("0")
             # For ARS and DUAL: keep balance_aportes_ars, convert to USD after pending subtraction
 
         # Check for pending contribution payments and calculate total pending amount
-        from app.models.contribution_payment import ContributionPayment
-        from app.models.contribution import Contribution as ContributionModel
-
         pending_contribs = (
             db.query(ContributionPayment)
-            .join(ContributionModel, ContributionPayment.contribution_id == ContributionModel.id)
+            .join(Contribution, ContributionPayment.contribution_id == Contribution.id)
             .options(contains_eager(ContributionPayment.contribution))
             .filter(
                 ContributionPayment.user_id == current_user.id,
-                ContributionModel.project_id == project.id,
-                ContributionModel.is_unilateral == False,
-                ContributionModel.is_adjustment == False,
+                Contribution.project_id == project_id,
+                Contribution.is_unilateral == False,
+                Contribution.is_adjustment == False,
                 ContributionPayment.is_paid == False,
             )
             .all()
@@ -417,13 +467,13 @@ async def get_my_payment_status(
         current_rate = Decimal("0")
         if currency_mode == "DUAL":
             try:
-                current_rate = Decimal(str(await fetch_blue_dollar_rate()))
+                current_rate = await fetch_blue_dollar_rate()
             except Exception:
                 current_rate = Decimal("0")
 
         # Subtract pending solicitud contributions from balance before converting to USD
         for payment in pending_contribs:
-            net_due = Decimal(str(payment.amount_due or 0)) - Decimal(str(payment.amount_offset or 0))
+            net_due = (payment.amount_due or Decimal("0")) - (payment.amount_offset or Decimal("0"))
             contrib_currency = payment.contribution.currency.value if payment.contribution and payment.contribution.currency else "ARS"
             if net_due <= 0:
                 continue
@@ -463,7 +513,7 @@ async def get_my_payment_status(
 
 
 @router.get("/all-users-status", response_model=List[UserPaymentStatus])
-async def get_all_users_payment_status(
+def get_all_users_payment_status(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -476,10 +526,13 @@ async def get_all_users_payment_status(
         .all()
     )
 
+    # Every user's totals in one GROUP BY query
+    summaries = get_payment_summaries_for_users(db, [u.id for u in users])
+
     result = []
     for user in users:
-        summary = get_user_payment_summary(db, user.id)
-        result.append(UserPaymentStatus(
+        summary = summaries[user.id]
+        result.append(UserPaymentStatus.model_construct(
             user_id=user.id,
             user_name=user.full_name,
             participation_percentage=Decimal("0"),  # No global participation (project-level only)
@@ -492,11 +545,11 @@ async def get_all_users_payment_status(
             pending_payments_count=summary["pending_payments_count"],
         ))
 
-    return result
+    return Response(content=_user_status_list_adapter.dump_json(result), media_type="application/json")
 
 
 @router.get("/expense-status/{expense_id}", response_model=ExpensePaymentStatus)
-async def get_expense_payment_status(
+def get_expense_payment_status(
     expense_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -507,7 +560,6 @@ async def get_expense_payment_status(
     """
     expense = db.query(Expense).filter(Expense.id == expense_id).first()
     if not expense:
-        from fastapi import HTTPException, status
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Expense not found",
@@ -519,7 +571,8 @@ async def get_expense_payment_status(
             ParticipantPayment.expense_id == expense_id,
             ParticipantPayment.is_deleted == False,
         )
-        .options(joinedload(ParticipantPayment.user))
+        # Users come in with the payments; any other lazy load here is a bug
+        .options(joinedload(ParticipantPayment.user), raiseload("*"))
         .all()
     )
 
@@ -533,16 +586,16 @@ async def get_expense_payment_status(
             payment_id=payment.id,
             user_id=payment.user_id,
             user_name=user.full_name if user else "Unknown",
-            amount_due_usd=Decimal(str(payment.amount_due_usd)),
-            amount_due_ars=Decimal(str(payment.amount_due_ars)),
+            amount_due_usd=payment.amount_due_usd,
+            amount_due_ars=payment.amount_due_ars,
             is_pending_approval=payment.is_pending_approval,
             is_paid=payment.is_paid,
             paid_at=payment.paid_at,
             submitted_at=payment.submitted_at,
             rejection_reason=payment.rejection_reason,
-            exchange_rate_at_payment=Decimal(str(payment.exchange_rate_at_payment)) if payment.exchange_rate_at_payment else None,
-            amount_paid_usd=Decimal(str(payment.amount_paid_usd)) if payment.amount_paid_usd else None,
-            amount_paid_ars=Decimal(str(payment.amount_paid_ars)) if payment.amount_paid_ars else None,
+            exchange_rate_at_payment=payment.exchange_rate_at_payment or None,
+            amount_paid_usd=payment.amount_paid_usd or None,
+            amount_paid_ars=payment.amount_paid_ars or None,
             receipt_file_path=payment.receipt_file_path,
         ))
 
@@ -554,8 +607,8 @@ async def get_expense_payment_status(
     return ExpensePaymentStatus(
         expense_id=expense.id,
         description=expense.description,
-        total_amount_usd=Decimal(str(expense.amount_usd)),
-        total_amount_ars=Decimal(str(expense.amount_ars)),
+        total_amount_usd=expense.amount_usd,
+        total_amount_ars=expense.amount_ars,
         participants=participants,
         fully_paid=pending_count == 0,
         paid_count=paid_count,
@@ -563,8 +616,70 @@ async def get_expense_payment_status(
     )
 
 
+def _export_cell(ws, value, **styles):
+    """Build a write-only cell for the Excel export with the given style attributes."""
+    from openpyxl.cell import WriteOnlyCell
+
+    cell = WriteOnlyCell(ws, value=value)
+    for attr, style in styles.items():
+        setattr(cell, attr, style)
+    return cell
+
+
+def _iter_file_chunks(file, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Yield a file's contents in chunks, closing it once fully read."""
+    try:
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
+
+
+@lru_cache()
+def _export_styles() -> dict:
+    """
+    Fonts, fills and borders shared by every Excel export, built on first use.
+    NamedStyles bind to a single workbook, so only their definitions are cached
+    and each export registers its own.
+    """
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from openpyxl.styles.fonts import DEFAULT_FONT
+
+    def solid_fill(color):
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+    center_align = Alignment(horizontal="center", vertical="center")
+    thin = Side(style='thin')
+    thin_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+    return {
+        "named": {
+            "export_header": dict(font=Font(bold=True, color="FFFFFF", size=11), fill=solid_fill("4472C4"),
+                                  alignment=center_align, border=thin_border),
+            "export_cell": dict(font=DEFAULT_FONT, border=thin_border),
+            "export_center": dict(font=DEFAULT_FONT, border=thin_border, alignment=center_align),
+            "export_date": dict(font=DEFAULT_FONT, border=thin_border, number_format=EXPORT_DATE_FORMAT),
+            "export_currency": dict(font=DEFAULT_FONT, border=thin_border, number_format=EXPORT_CURRENCY_FORMAT),
+            "export_percentage": dict(font=DEFAULT_FONT, border=thin_border,
+                                      number_format='0.00"%"', alignment=center_align),
+        },
+        "center_align": center_align,
+        "section_font": Font(bold=True, size=12),
+        "bold_font": Font(bold=True),
+        "member_font": Font(bold=True, size=12),
+        "empty_font": Font(italic=True, color="888888"),
+        "positive_font": Font(bold=True, color="1A7A4A"),
+        "negative_font": Font(bold=True, color="C00000"),
+        "credit_fill": solid_fill("E2EFDA"),  # green: individual contribution
+        "debit_fill": solid_fill("FDECEA"),  # pink: group solicitud paid
+        "debt_fill": solid_fill("FCE4D6"),  # orange: group solicitud unpaid
+        "total_fill": solid_fill("F2F2F2"),  # gray: totals row
+        "member_fill": solid_fill("D9E1F2"),  # blue-gray: member header
+    }
+
+
 @router.get("/export-excel")
-async def export_project_excel(
+def export_project_excel(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -574,37 +689,30 @@ async def export_project_excel(
     - Sheet 1: All expenses with payment details
     - Sheet 2: Dashboard summary statistics
     - Sheet 3: Summary by participant
+
+    The workbook is built in write-only mode: rows are flushed to disk as they
+    are appended and styles are set on each cell before its row is written.
     """
     from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from openpyxl.styles import NamedStyle
     from openpyxl.utils import get_column_letter
 
     if not project:
-        from fastapi import HTTPException, status
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Project context required (X-Project-ID header)"
         )
 
-    # Create workbook
-    wb = Workbook()
-    wb.remove(wb.active)  # Remove default sheet
+    # Create workbook (write-only: no default sheet, column widths before rows)
+    wb = Workbook(write_only=True)
 
-    # Styles
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    center_align = Alignment(horizontal="center", vertical="center")
-    currency_format = '"$"#,##0.00'
-    date_format = "DD/MM/YYYY"
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    # Shared cell styles, registered once and referenced by name from each cell
+    styles = _export_styles()
+    for name, definition in styles["named"].items():
+        wb.add_named_style(NamedStyle(name=name, **definition))
 
     # Determine currency mode
-    currency_mode = getattr(project, 'currency_mode', None) or "DUAL"
+    currency_mode = project.currency_mode or "DUAL"
 
     # === SHEET 1: GASTOS ===
     ws_expenses = wb.create_sheet("Gastos")
@@ -619,141 +727,129 @@ async def export_project_excel(
     else:
         headers = ["ID", "Fecha", "Descripción", "Proveedor", "Categoría", "Rubro",
                    "Monto USD", "Monto ARS", "Estado", "Pagado", "Pendiente"]
-    ws_expenses.append(headers)
-
-    # Style header row
-    for col_num, header in enumerate(headers, 1):
-        cell = ws_expenses.cell(row=1, column=col_num)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = center_align
-        cell.border = thin_border
-
-    # Get expenses (exclude deleted)
-    expenses = db.query(Expense).options(
-        joinedload(Expense.rubro),
-    ).filter(
-        Expense.project_id == project.id,
-        Expense.is_deleted == False,
-    ).order_by(Expense.expense_date.desc()).all()
 
-    # Batch load all payments for the project to avoid N+1
-    all_expense_payments = db.query(ParticipantPayment).join(Expense).filter(
+    # Column widths
+    for col in range(1, len(headers) + 1):
+        ws_expenses.column_dimensions[get_column_letter(col)].width = EXPORT_EXPENSE_COLUMN_WIDTH
+
+    ws_expenses.append([
+        _export_cell(ws_expenses, header, style="export_header")
+        for header in headers
+    ])
+
+    # Paid/pending counts per expense as a grouped subquery joined to the
+    # expenses below (the sheet only needs counts)
+    payment_counts = db.query(
+        ParticipantPayment.expense_id,
+        func.count(ParticipantPayment.id).label("total"),
+        func.sum(case((ParticipantPayment.is_paid == True, 1), else_=0)).label("paid"),
+    ).join(Expense).filter(
         Expense.project_id == project.id,
         ParticipantPayment.is_deleted == False,
-    ).all()
-    payments_by_expense_id = {}
-    for p in all_expense_payments:
-        payments_by_expense_id.setdefault(p.expense_id, []).append(p)
-
-    for expense in expenses:
-        payments = payments_by_expense_id.get(expense.id, [])
+    ).group_by(ParticipantPayment.expense_id).subquery()
+
+    # Stream expenses (exclude deleted) in batches, loading only the columns the
+    # sheet writes; rows go straight to the write-only sheet as they arrive
+    expenses = db.query(Expense, payment_counts.c.total, payment_counts.c.paid).outerjoin(
+        payment_counts, payment_counts.c.expense_id == Expense.id
+    ).options(
+        load_only(
+            Expense.id, Expense.expense_date, Expense.description,
+            Expense.amount_usd, Expense.amount_ars,
+        ),
+        joinedload(Expense.provider).load_only(Provider.name),
+        joinedload(Expense.category).load_only(Category.name),
+        joinedload(Expense.rubro).load_only(Rubro.name),
+        raiseload("*"),
+    ).filter(
+        Expense.project_id == project.id,
+        Expense.is_deleted == False,
+    ).order_by(Expense.expense_date.desc()).yield_per(EXPORT_EXPENSE_BATCH_SIZE)
+
+    # Per-column cell styles, applied as each row is appended
+    expense_column_styles = [
+        "export_center",  # ID
+        "export_date",  # Fecha
+        "export_cell", "export_cell", "export_cell", "export_cell",  # Descripción, Proveedor, Categoría, Rubro
+        "export_currency",  # Amount (col 7, shifted by Rubro)
+    ]
+    if currency_mode == "DUAL":
+        expense_column_styles.append("export_currency")  # ARS
+    expense_column_styles += ["export_center"] * 3  # Estado, Pagado, Pendiente
 
-        paid_count = sum(1 for p in payments if p.is_paid)
-        pending_count = len(payments) - paid_count
-        status = "Pagado" if pending_count == 0 else ("Parcial" if paid_count > 0 else "Pendiente")
+    # Amount columns written for this currency mode, resolved once for all rows
+    if currency_mode == "ARS":
+        amount_attrs = ("amount_ars",)
+    elif currency_mode == "USD":
+        amount_attrs = ("amount_usd",)
+    else:
+        amount_attrs = ("amount_usd", "amount_ars")
+
+    # Sheet 2 totals, accumulated while the expenses stream past
+    total_usd = Decimal("0")
+    total_ars = Decimal("0")
+    expense_count = 0
+    total_payments = 0
+    paid_payments = 0
+
+    for expense, total_count, paid_count in expenses:
+        paid_count = int(paid_count or 0)
+        pending_count = (total_count or 0) - paid_count
+
+        total_usd += expense.amount_usd
+        total_ars += expense.amount_ars
+        expense_count += 1
+        total_payments += paid_count + pending_count
+        paid_payments += paid_count
+        payment_status = "Pagado" if pending_count == 0 else ("Parcial" if paid_count > 0 else "Pendiente")
 
         # Remove timezone from date for Excel compatibility
         expense_date = expense.expense_date.replace(tzinfo=None) if expense.expense_date else None
 
-        rubro_name = expense.rubro.name if expense.rubro else "-"
-        if currency_mode == "ARS":
-            row = [
-                expense.id, expense_date, expense.description,
-                expense.provider.name if expense.provider else "-",
-                expense.category.name if expense.category else "-",
-                rubro_name, float(expense.amount_ars), status, paid_count, pending_count,
-            ]
-        elif currency_mode == "USD":
-            row = [
-                expense.id, expense_date, expense.description,
-                expense.provider.name if expense.provider else "-",
-                expense.category.name if expense.category else "-",
-                rubro_name, float(expense.amount_usd), status, paid_count, pending_count,
-            ]
-        else:
-            row = [
-                expense.id, expense_date, expense.description,
-                expense.provider.name if expense.provider else "-",
-                expense.category.name if expense.category else "-",
-                rubro_name, float(expense.amount_usd), float(expense.amount_ars),
-                status, paid_count, pending_count,
-            ]
-        ws_expenses.append(row)
-
-    # Format columns
-    for row in ws_expenses.iter_rows(min_row=2, max_row=ws_expenses.max_row):
-        row[0].alignment = center_align  # ID
-        row[1].number_format = date_format  # Fecha
-        row[6].number_format = currency_format  # Amount (col 7, shifted by Rubro)
-        if currency_mode == "DUAL":
-            row[7].number_format = currency_format  # ARS
-            row[8].alignment = center_align  # Estado
-            row[9].alignment = center_align  # Pagado
-            row[10].alignment = center_align  # Pendiente
-        else:
-            row[7].alignment = center_align  # Estado
-            row[8].alignment = center_align  # Pagado
-            row[9].alignment = center_align  # Pendiente
-        for cell in row:
-            cell.border = thin_border
+        row = [
+            expense.id, expense_date, expense.description,
+            expense.provider.name if expense.provider else "-",
+            expense.category.name if expense.category else "-",
+            expense.rubro.name if expense.rubro else "-",
+            *(float(getattr(expense, attr)) for attr in amount_attrs),
+            payment_status, paid_count, pending_count,
+        ]
 
-    # Auto-adjust column widths
-    for col in range(1, len(headers) + 1):
-        ws_expenses.column_dimensions[get_column_letter(col)].width = 15
+        ws_expenses.append([
+            _export_cell(ws_expenses, value, style=style)
+            for value, style in zip(row, expense_column_styles)
+        ])
 
     # === SHEET 2: DASHBOARD RESUMEN ===
     ws_summary = wb.create_sheet("Resumen Dashboard")
 
-    # Get summary data
-    expense_totals = db.query(
-        func.sum(Expense.amount_usd).label("total_usd"),
-        func.sum(Expense.amount_ars).label("total_ars"),
-        func.count(Expense.id).label("count"),
-    ).filter(Expense.project_id == project.id).first()
-
-    from sqlalchemy import Integer
+    # Summary data comes from the Gastos pass above (active expenses only)
+    total_usd = float(total_usd)
+    total_ars = float(total_ars)
+    pending_payments = total_payments - paid_payments
 
-    payment_totals = db.query(
-        func.count(ParticipantPayment.id).label("total_payments"),
-        func.sum(func.cast(ParticipantPayment.is_paid, Integer)).label("paid_count"),
-    ).join(Expense).filter(Expense.project_id == project.id).first()
+    # Style summary sheet
+    for col, width in EXPORT_SUMMARY_COLUMN_WIDTHS.items():
+        ws_summary.column_dimensions[col].width = width
 
-    total_usd = float(expense_totals.total_usd or 0)
-    total_ars = float(expense_totals.total_ars or 0)
-    expense_count = expense_totals.count or 0
-    total_payments = payment_totals.total_payments or 0
-    paid_payments = int(payment_totals.paid_count or 0)
-    pending_payments = total_payments - paid_payments
+    section_font = styles["section_font"]
 
-    # Add summary data
-    ws_summary.append(["RESUMEN DEL PROYECTO", project.name])
+    # Add summary data (bold section headers, currency totals)
+    ws_summary.append([_export_cell(ws_summary, "RESUMEN DEL PROYECTO", font=section_font), project.name])
     ws_summary.append(["Fecha de generación", datetime.now().strftime("%d/%m/%Y %H:%M")])
     ws_summary.append([])
 
-    ws_summary.append(["GASTOS"])
+    ws_summary.append([_export_cell(ws_summary, "GASTOS", font=section_font)])
     ws_summary.append(["Total de gastos", expense_count])
-    ws_summary.append(["Total en USD", total_usd])
-    ws_summary.append(["Total en ARS", total_ars])
+    ws_summary.append(["Total en USD", _export_cell(ws_summary, total_usd, number_format=EXPORT_CURRENCY_FORMAT)])
+    ws_summary.append(["Total en ARS", _export_cell(ws_summary, total_ars, number_format=EXPORT_CURRENCY_FORMAT)])
     ws_summary.append([])
 
-    ws_summary.append(["PAGOS"])
+    ws_summary.append([_export_cell(ws_summary, "PAGOS", font=section_font)])
     ws_summary.append(["Total de pagos", total_payments])
     ws_summary.append(["Pagos realizados", paid_payments])
     ws_summary.append(["Pagos pendientes", pending_payments])
 
-    # Style summary sheet
-    ws_summary.column_dimensions['A'].width = 25
-    ws_summary.column_dimensions['B'].width = 20
-
-    # Bold headers
-    for row in [1, 4, 9]:
-        ws_summary.cell(row=row, column=1).font = Font(bold=True, size=12)
-
-    # Currency format
-    ws_summary.cell(row=6, column=2).number_format = currency_format
-    ws_summary.cell(row=7, column=2).number_format = currency_format
-
     # === SHEET 3: POR PARTICIPANTE ===
     ws_participants = wb.create_sheet("Por Participante")
 
@@ -767,61 +863,50 @@ async def export_project_excel(
     else:
         part_headers = ["Participante", "Email", "% Participación", "Total a pagar USD",
                         "Pagado USD", "Pendiente USD"]
-    ws_participants.append(part_headers)
-
-    # Style header
-    for col_num, header in enumerate(part_headers, 1):
-        cell = ws_participants.cell(row=1, column=col_num)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = center_align
-        cell.border = thin_border
-
-    # Get participants
-    members = db.query(ProjectMember).join(User).filter(
+
+    # Column widths
+    for col, width in EXPORT_PARTICIPANT_COLUMN_WIDTHS.items():
+        ws_participants.column_dimensions[col].width = width
+
+    ws_participants.append([
+        _export_cell(ws_participants, header, style="export_header")
+        for header in part_headers
+    ])
+
+    # Active project members with their users, loaded once for Sheets 3 and 4
+    # (Sheet 3 only lists members whose user account is active)
+    active_members = db.query(ProjectMember).join(User).filter(
         ProjectMember.project_id == project.id,
         ProjectMember.is_active == True,
-        User.is_active == True,
-    ).all()
+    ).options(contains_eager(ProjectMember.user), raiseload("*")).all()
+    members = [m for m in active_members if m.user.is_active]
+
+    # All participants' payment totals in one GROUP BY query
+    summaries = get_payment_summaries_for_users(db, [m.user_id for m in members], project.id)
+
+    participant_column_styles = [
+        "export_cell", "export_cell",  # Participante, Email
+        "export_percentage",  # Percentage
+        "export_currency", "export_currency", "export_currency",  # Total, Pagado, Pendiente
+    ]
+
+    # Summary keys for this currency mode, resolved once for all rows
+    suffix = "ars" if currency_mode == "ARS" else "usd"
+    summary_keys = (f"total_due_{suffix}", f"total_paid_{suffix}", f"pending_{suffix}")
 
     for member in members:
         user = member.user
-        summary = get_user_payment_summary(db, user.id, project.id)
+        summary = summaries[user.id]
 
-        if currency_mode == "ARS":
-            row = [
-                user.full_name, user.email, float(member.participation_percentage),
-                float(summary["total_due_ars"]), float(summary["total_paid_ars"]),
-                float(summary["pending_ars"]),
-            ]
-        else:
-            row = [
-                user.full_name, user.email, float(member.participation_percentage),
-                float(summary["total_due_usd"]), float(summary["total_paid_usd"]),
-                float(summary["pending_usd"]),
-            ]
-        ws_participants.append(row)
-
-    # Format columns
-    for row in ws_participants.iter_rows(min_row=2, max_row=ws_participants.max_row):
-        row[2].number_format = '0.00"%"'  # Percentage
-        row[2].alignment = center_align
-        row[3].number_format = currency_format  # Total USD
-        row[4].number_format = currency_format  # Pagado USD
-        row[5].number_format = currency_format  # Pendiente USD
-        for cell in row:
-            cell.border = thin_border
-
-    # Auto-adjust column widths
-    ws_participants.column_dimensions['A'].width = 25
-    ws_participants.column_dimensions['B'].width = 30
-    ws_participants.column_dimensions['C'].width = 18
-    for col in [4, 5, 6]:
-        ws_participants.column_dimensions[get_column_letter(col)].width = 18
-
-    from app.models.contribution import Contribution as ContributionModel, ContributionStatus as ContribStatus
-    from app.models.contribution_payment import ContributionPayment as ContribPayment
-    from sqlalchemy.orm import joinedload as jl
+        row = [
+            user.full_name, user.email, float(member.participation_percentage),
+            *(float(summary[key]) for key in summary_keys),
+        ]
+
+        ws_participants.append([
+            _export_cell(ws_participants, value, style=style)
+            for value, style in zip(row, participant_column_styles)
+        ])
 
     currency_label = "USD" if currency_mode == "USD" else "ARS"
 
@@ -830,31 +915,33 @@ async def export_project_excel(
     # and group solicitud obligations with running balance.
     ws_estado = wb.create_sheet("Estado por Participante")
 
-    credit_fill = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")   # green: individual contribution
-    debit_fill  = PatternFill(start_color="FDECEA", end_color="FDECEA", fill_type="solid")   # pink: group solicitud paid
-    debt_fill   = PatternFill(start_color="FCE4D6", end_color="FCE4D6", fill_type="solid")   # orange: group solicitud unpaid
-    total_fill  = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")   # gray: totals row
-    member_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")   # blue-gray: member header
-    bold_font   = Font(bold=True)
-
-    # Load all active project members
-    members_estado = (
-        db.query(ProjectMember)
-        .filter(ProjectMember.project_id == project.id, ProjectMember.is_active == True)
-        .options(jl(ProjectMember.user))
-        .all()
-    )
+    # Column widths
+    for col, width in EXPORT_ESTADO_COLUMN_WIDTHS.items():
+        ws_estado.column_dimensions[col].width = width
+
+    credit_fill = styles["credit_fill"]
+    debit_fill = styles["debit_fill"]
+    debt_fill = styles["debt_fill"]
+    total_fill = styles["total_fill"]
+    member_fill = styles["member_fill"]
+    bold_font = styles["bold_font"]
+    positive_font = styles["positive_font"]
+    negative_font = styles["negative_font"]
+    estado_column_styles = [
+        "export_date", "export_center", "export_cell",  # Fecha, Tipo, Descripción
+        "export_currency", "export_currency", "export_currency",  # Ingreso, Egreso, Saldo
+    ]
 
     # Batch load all approved unilateral contributions, grouped by contributor
     all_unilateral = (
-        db.query(ContributionModel)
+        db.query(Contribution)
         .filter(
-            ContributionModel.project_id == project.id,
-            ContributionModel.is_unilateral == True,
-            ContributionModel.is_adjustment == False,
-            ContributionModel.status == ContribStatus.APPROVED,
+            Contribution.project_id == project.id,
+            Contribution.is_unilateral == True,
+            Contribution.is_adjustment == False,
+            Contribution.status == ContributionStatus.APPROVED,
         )
-        .order_by(ContributionModel.created_at)
+        .order_by(Contribution.created_at)
         .all()
     )
     unilateral_by_user = {}
@@ -863,21 +950,21 @@ async def export_project_excel(
 
     # Batch load all group contributions and their payments
     all_group = (
-        db.query(ContributionModel)
+        db.query(Contribution)
         .filter(
-            ContributionModel.project_id == project.id,
-            ContributionModel.is_unilateral == False,
-            ContributionModel.is_adjustment == False,
+            Contribution.project_id == project.id,
+            Contribution.is_unilateral == False,
+            Contribution.is_adjustment == False,
         )
-        .order_by(ContributionModel.created_at)
+        .order_by(Contribution.created_at)
         .all()
     )
     group_by_id = {c.id: c for c in all_group}
     all_group_ids = [c.id for c in all_group]
 
     all_cp = (
-        db.query(ContribPayment)
-        .filter(ContribPayment.contribution_id.in_(all_group_ids))
+        db.query(ContributionPayment)
+        .filter(ContributionPayment.contribution_id.in_(all_group_ids))
         .all()
     ) if all_group_ids else []
     cp_by_user = {}
@@ -886,16 +973,19 @@ async def export_project_excel(
 
     current_row = 1
 
-    for member in members_estado:
+    for member in active_members:
         user = member.user
-        if not user:
-            continue
+
+        # Blank separator between participants
+        if current_row > 1:
+            ws_estado.append([])
+            current_row += 1
 
         # --- Member header ---
-        member_cell = ws_estado.cell(row=current_row, column=1, value=f"► {user.full_name}")
-        member_cell.font = Font(bold=True, size=12)
-        member_cell.fill = member_fill
-        ws_estado.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=6)
+        ws_estado.append([
+            _export_cell(ws_estado, f"► {user.full_name}", font=styles["member_font"], fill=member_fill)
+        ])
+        ws_estado.merged_cells.add(f"A{current_row}:F{current_row}")
         current_row += 1
 
         # --- Column headers ---
@@ -905,12 +995,10 @@ async def export_project_excel(
             f"Egreso ({currency_label})",
             f"Saldo ({currency_label})",
         ]
-        for col_idx, h in enumerate(col_headers, 1):
-            cell = ws_estado.cell(row=current_row, column=col_idx, value=h)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = center_align
-            cell.border = thin_border
+        ws_estado.append([
+            _export_cell(ws_estado, h, style="export_header")
+            for h in col_headers
+        ])
         current_row += 1
 
         # --- Build event list ---
@@ -922,7 +1010,7 @@ async def export_project_excel(
                 'date': u.created_at,
                 'tipo': 'Aporte Individual',
                 'desc': u.description or '—',
-                'ingreso': Decimal(str(u.amount or 0)),
+                'ingreso': u.amount or Decimal("0"),
                 'egreso': Decimal('0'),
                 'is_debt': False,
                 'notas': None,
@@ -933,8 +1021,8 @@ async def export_project_excel(
             contrib = group_by_id.get(p.contribution_id)
             if not contrib:
                 continue
-            amount_due   = Decimal(str(p.amount_due or 0))
-            amount_offset = Decimal(str(p.amount_offset or 0))
+            amount_due   = p.amount_due or Decimal("0")
+            amount_offset = p.amount_offset or Decimal("0")
             net_due = max(amount_due - amount_offset, Decimal('0'))
 
             if p.is_paid:
@@ -973,9 +1061,10 @@ async def export_project_excel(
         total_egreso    = Decimal('0')
 
         if not events:
-            no_data = ws_estado.cell(row=current_row, column=1, value="Sin movimientos")
-            no_data.font = Font(italic=True, color="888888")
-            ws_estado.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=6)
+            ws_estado.append([
+                _export_cell(ws_estado, "Sin movimientos", font=styles["empty_font"])
+            ])
+            ws_estado.merged_cells.add(f"A{current_row}:F{current_row}")
             current_row += 1
         else:
             for event in events:
@@ -992,16 +1081,6 @@ async def export_project_excel(
                 egreso_val  = float(event['egreso'])  if event['egreso']  > 0 else None
                 saldo_val   = float(running_balance)
 
-                row_data = [fecha, event['tipo'], desc, ingreso_val, egreso_val, saldo_val]
-                for col_idx, val in enumerate(row_data, 1):
-                    ws_estado.cell(row=current_row, column=col_idx, value=val).border = thin_border
-
-                ws_estado.cell(row=current_row, column=1).number_format = date_format
-                ws_estado.cell(row=current_row, column=1).alignment = center_align
-                ws_estado.cell(row=current_row, column=2).alignment = center_align
-                for col_idx in [4, 5, 6]:
-                    ws_estado.cell(row=current_row, column=col_idx).number_format = currency_format
-
                 # Row background color
                 if event['tipo'] == 'Aporte Individual':
                     row_fill = credit_fill
@@ -1009,49 +1088,41 @@ async def export_project_excel(
                     row_fill = debt_fill
                 else:
                     row_fill = debit_fill
-                for col_idx in range(1, 7):
-                    ws_estado.cell(row=current_row, column=col_idx).fill = row_fill
+
+                row_data = [fecha, event['tipo'], desc, ingreso_val, egreso_val, saldo_val]
+                cells = [
+                    _export_cell(ws_estado, val, style=style, fill=row_fill)
+                    for val, style in zip(row_data, estado_column_styles)
+                ]
+                cells[0].alignment = styles["center_align"]
 
                 # Saldo cell color: green if positive, red if negative
-                saldo_cell = ws_estado.cell(row=current_row, column=6)
                 if running_balance > 0:
-                    saldo_cell.font = Font(color="1A7A4A", bold=True)
+                    cells[5].font = positive_font
                 elif running_balance < 0:
-                    saldo_cell.font = Font(color="C00000", bold=True)
+                    cells[5].font = negative_font
 
+                ws_estado.append(cells)
                 current_row += 1
 
             # Total row
-            for col_idx, val in enumerate(
-                [None, None, "SALDO FINAL",
-                 float(total_ingreso), float(total_egreso), float(running_balance)], 1
-            ):
-                cell = ws_estado.cell(row=current_row, column=col_idx, value=val)
-                cell.font = bold_font
-                cell.fill = total_fill
-                cell.border = thin_border
-                if col_idx in [4, 5, 6]:
-                    cell.number_format = currency_format
-            saldo_final_cell = ws_estado.cell(row=current_row, column=6)
+            cells = [
+                _export_cell(ws_estado, val, style=style, font=bold_font, fill=total_fill)
+                for val, style in zip(
+                    [None, None, "SALDO FINAL",
+                     float(total_ingreso), float(total_egreso), float(running_balance)],
+                    ["export_cell"] * 3 + ["export_currency"] * 3,
+                )
+            ]
             if running_balance > 0:
-                saldo_final_cell.font = Font(bold=True, color="1A7A4A")
+                cells[5].font = positive_font
             elif running_balance < 0:
-                saldo_final_cell.font = Font(bold=True, color="C00000")
+                cells[5].font = negative_font
+            ws_estado.append(cells)
             current_row += 1
 
-        # Blank separator between participants
-        current_row += 1
-
-    # Column widths
-    ws_estado.column_dimensions['A'].width = 14   # Fecha
-    ws_estado.column_dimensions['B'].width = 20   # Tipo
-    ws_estado.column_dimensions['C'].width = 50   # Descripción
-    ws_estado.column_dimensions['D'].width = 22   # Ingreso
-    ws_estado.column_dimensions['E'].width = 22   # Egreso
-    ws_estado.column_dimensions['F'].width = 22   # Saldo
-
-    # Save to BytesIO
-    excel_file = BytesIO()
+    # Save to a temporary file and stream it back in chunks
+    excel_file = tempfile.TemporaryFile()
     wb.save(excel_file)
     excel_file.seek(0)
 
@@ -1060,16 +1131,16 @@ async def export_project_excel(
 
     # Return as streaming response
     return StreamingResponse(
-        excel_file,
+        _iter_file_chunks(excel_file),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 
 @router.get("/expenses-by-provider", response_model=List[ExpenseByProvider])
-async def get_expenses_by_provider(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+def get_expenses_by_provider(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -1078,9 +1149,6 @@ async def get_expenses_by_provider(
     Get total expenses grouped by provider, ordered by total descending.
     Optionally filter by date range (expense_date).
     """
-    from app.models.provider import Provider
-    from sqlalchemy import case
-
     # Build expense query
     query = db.query(
         Expense.provider_id,
@@ -1088,8 +1156,8 @@ async def get_expenses_by_provider(
             (Expense.provider_id.is_(None), "Sin proveedor"),
             else_=Provider.name
         ).label("provider_name"),
-        func.sum(Expense.amount_usd).label("total_usd"),
-        func.sum(Expense.amount_ars).label("total_ars"),
+        func.coalesce(func.sum(Expense.amount_usd), 0).label("total_usd"),
+        func.coalesce(func.sum(Expense.amount_ars), 0).label("total_ars"),
         func.count(Expense.id).label("expenses_count"),
     ).outerjoin(Provider, Expense.provider_id == Provider.id)
 
@@ -1102,31 +1170,32 @@ async def get_expenses_by_provider(
 
     # Date filters
     if start_date:
-        query = query.filter(Expense.expense_date >= datetime.fromisoformat(start_date))
+        query = query.filter(Expense.expense_date >= start_date)
     if end_date:
-        query = query.filter(Expense.expense_date <= datetime.fromisoformat(end_date))
+        query = query.filter(Expense.expense_date <= end_date)
 
     # Group and order
     query = query.group_by(Expense.provider_id, Provider.name).order_by(func.sum(Expense.amount_usd).desc())
 
     results = query.all()
 
-    return [
-        ExpenseByProvider(
+    result = [
+        ExpenseByProvider.model_construct(
             provider_id=r.provider_id,
             provider_name=r.provider_name,
-            total_usd=Decimal(str(r.total_usd or 0)),
-            total_ars=Decimal(str(r.total_ars or 0)),
+            total_usd=r.total_usd,
+            total_ars=r.total_ars,
             expenses_count=r.expenses_count,
         )
         for r in results
     ]
+    return Response(content=_provider_list_adapter.dump_json(result), media_type="application/json")
 
 
 @router.get("/expenses-by-category", response_model=List[ExpenseByCategory])
-async def get_expenses_by_category(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+def get_expenses_by_category(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -1135,9 +1204,6 @@ async def get_expenses_by_category(
     Get total expenses grouped by category, ordered by total descending.
     Optionally filter by date range (expense_date).
     """
-    from app.models.category import Category
-    from sqlalchemy import case
-
     # Build expense query
     query = db.query(
         Expense.category_id,
@@ -1145,8 +1211,8 @@ async def get_expenses_by_category(
             (Expense.category_id.is_(None), "Sin categoría"),
             else_=Category.name
         ).label("category_name"),
-        func.sum(Expense.amount_usd).label("total_usd"),
-        func.sum(Expense.amount_ars).label("total_ars"),
+        func.coalesce(func.sum(Expense.amount_usd), 0).label("total_usd"),
+        func.coalesce(func.sum(Expense.amount_ars), 0).label("total_ars"),
         func.count(Expense.id).label("expenses_count"),
     ).outerjoin(Category, Expense.category_id == Category.id)
 
@@ -1159,31 +1225,32 @@ async def get_expenses_by_category(
 
     # Date filters
     if start_date:
-        query = query.filter(Expense.expense_date >= datetime.fromisoformat(start_date))
+        query = query.filter(Expense.expense_date >= start_date)
     if end_date:
-        query = query.filter(Expense.expense_date <= datetime.fromisoformat(end_date))
+        query = query.filter(Expense.expense_date <= end_date)
 
     # Group and order
     query = query.group_by(Expense.category_id, Category.name).order_by(func.sum(Expense.amount_usd).desc())
 
     results = query.all()
 
-    return [
-        ExpenseByCategory(
+    result = [
+        ExpenseByCategory.model_construct(
             category_id=r.category_id,
             category_name=r.category_name,
-            total_usd=Decimal(str(r.total_usd or 0)),
-            total_ars=Decimal(str(r.total_ars or 0)),
+            total_usd=r.total_usd,
+            total_ars=r.total_ars,
             expenses_count=r.expenses_count,
         )
         for r in results
     ]
+    return Response(content=_category_list_adapter.dump_json(result), media_type="application/json")
 
 
 @router.get("/expenses-by-rubro", response_model=List[ExpenseByRubro])
-async def get_expenses_by_rubro(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+def get_expenses_by_rubro(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -1192,17 +1259,14 @@ async def get_expenses_by_rubro(
     Get total expenses grouped by rubro, ordered by total descending.
     Optionally filter by date range (expense_date).
     """
-    from app.models.rubro import Rubro
-    from sqlalchemy import case
-
     query = db.query(
         Expense.rubro_id,
         case(
             (Expense.rubro_id.is_(None), "Otros"),
             else_=Rubro.name
         ).label("rubro_name"),
-        func.sum(Expense.amount_usd).label("total_usd"),
-        func.sum(Expense.amount_ars).label("total_ars"),
+        func.coalesce(func.sum(Expense.amount_usd), 0).label("total_usd"),
+        func.coalesce(func.sum(Expense.amount_ars), 0).label("total_ars"),
         func.count(Expense.id).label("expenses_count"),
     ).outerjoin(Rubro, Expense.rubro_id == Rubro.id)
 
@@ -1212,28 +1276,133 @@ async def get_expenses_by_rubro(
     query = query.filter(Expense.is_deleted == False)
 
     if start_date:
-        query = query.filter(Expense.expense_date >= datetime.fromisoformat(start_date))
+        query = query.filter(Expense.expense_date >= start_date)
     if end_date:
-        query = query.filter(Expense.expense_date <= datetime.fromisoformat(end_date))
+        query = query.filter(Expense.expense_date <= end_date)
 
     query = query.group_by(Expense.rubro_id, Rubro.name).order_by(func.sum(Expense.amount_usd).desc())
 
     results = query.all()
 
-    return [
-        ExpenseByRubro(
+    result = [
+        ExpenseByRubro.model_construct(
             rubro_id=r.rubro_id,
             rubro_name=r.rubro_name,
-            total_usd=Decimal(str(r.total_usd or 0)),
-            total_ars=Decimal(str(r.total_ars or 0)),
+            total_usd=r.total_usd,
+            total_ars=r.total_ars,
             expenses_count=r.expenses_count,
         )
         for r in results
     ]
+    return Response(content=_rubro_list_adapter.dump_json(result), media_type="application/json")
+
+
+def _rollup_breakdown(rows, id_attr: str, name_attr: str) -> list:
+    """Roll breakdown rows up by one grouping column, ordered by total USD descending."""
+    totals = {}
+    for r in rows:
+        key = getattr(r, id_attr)
+        if key not in totals:
+            totals[key] = [getattr(r, name_attr), Decimal("0"), Decimal("0"), 0]
+        group = totals[key]
+        group[1] += r.total_usd
+        group[2] += r.total_ars
+        group[3] += r.expenses_count
+    return sorted(
+        ((key, *group) for key, group in totals.items()),
+        key=lambda group: group[2],
+        reverse=True,
+    )
+
+
+@router.get("/expenses-breakdown", response_model=ExpensesBreakdown)
+def get_expenses_breakdown(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    project: Optional[Project] = Depends(get_project_from_header),
+):
+    """
+    Get expenses grouped by provider, category and rubro in a single request.
+    Same data as the three expenses-by-* endpoints, from one pass over the expenses.
+    Optionally filter by date range (expense_date).
+    """
+    # Group by the provider/category/rubro combination once; each breakdown is
+    # then rolled up from these (few) rows in Python
+    provider_name = case((Expense.provider_id.is_(None), "Sin proveedor"), else_=Provider.name)
+    category_name = case((Expense.category_id.is_(None), "Sin categoría"), else_=Category.name)
+    rubro_name = case((Expense.rubro_id.is_(None), "Otros"), else_=Rubro.name)
+    query = db.query(
+        Expense.provider_id,
+        provider_name.label("provider_name"),
+        Expense.category_id,
+        category_name.label("category_name"),
+        Expense.rubro_id,
+        rubro_name.label("rubro_name"),
+        func.coalesce(func.sum(Expense.amount_usd), 0).label("total_usd"),
+        func.coalesce(func.sum(Expense.amount_ars), 0).label("total_ars"),
+        func.count(Expense.id).label("expenses_count"),
+    ).outerjoin(Provider, Expense.provider_id == Provider.id).outerjoin(
+        Category, Expense.category_id == Category.id
+    ).outerjoin(Rubro, Expense.rubro_id == Rubro.id)
+
+    if project:
+        query = query.filter(Expense.project_id == project.id)
+
+    query = query.filter(Expense.is_deleted == False)
+
+    if start_date:
+        query = query.filter(Expense.expense_date >= start_date)
+    if end_date:
+        query = query.filter(Expense.expense_date <= end_date)
+
+    rows = query.group_by(
+        Expense.provider_id, Provider.name,
+        Expense.category_id, Category.name,
+        Expense.rubro_id, Rubro.name,
+    ).all()
+
+    breakdown = ExpensesBreakdown.model_construct(
+        by_provider=[
+            ExpenseByProvider.model_construct(
+                provider_id=provider_id,
+                provider_name=name,
+                total_usd=total_usd,
+                total_ars=total_ars,
+                expenses_count=count,
+            )
+            for provider_id, name, total_usd, total_ars, count
+            in _rollup_breakdown(rows, "provider_id", "provider_name")
+        ],
+        by_category=[
+            ExpenseByCategory.model_construct(
+                category_id=category_id,
+                category_name=name,
+                total_usd=total_usd,
+                total_ars=total_ars,
+                expenses_count=count,
+            )
+            for category_id, name, total_usd, total_ars, count
+            in _rollup_breakdown(rows, "category_id", "category_name")
+        ],
+        by_rubro=[
+            ExpenseByRubro.model_construct(
+                rubro_id=rubro_id,
+                rubro_name=name,
+                total_usd=total_usd,
+                total_ars=total_ars,
+                expenses_count=count,
+            )
+            for rubro_id, name, total_usd, total_ars, count
+            in _rollup_breakdown(rows, "rubro_id", "rubro_name")
+        ],
+    )
+    return Response(content=breakdown.model_dump_json(), media_type="application/json")
 
 
 @router.get("/balances", response_model=List[MemberBalanceResponse])
-async def get_member_balances(
+def get_member_balances(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -1243,17 +1412,16 @@ async def get_member_balances(
     For DUAL mode, USD equivalent is calculated in real-time using current exchange rate.
     """
     if not project:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=400,
             detail="X-Project-ID header is required",
         )
 
-    currency_mode = getattr(project, 'currency_mode', 'DUAL') or 'DUAL'
+    currency_mode = project.currency_mode or "DUAL"
     balances_data = get_all_member_balances(db, project.id)
 
-    return [
-        MemberBalanceResponse(
+    result = [
+        MemberBalanceResponse.model_construct(
             user_id=b["user_id"],
             user_name=b["user_name"],
             user_email=b["user_email"],
@@ -1264,10 +1432,11 @@ async def get_member_balances(
         )
         for b in balances_data
     ]
+    return Response(content=_balance_list_adapter.dump_json(result), media_type="application/json")
 
 
 @router.get("/contributions-by-participant", response_model=List[ContributionsByParticipant])
-async def get_contributions_by_participant_endpoint(
+def get_contributions_by_participant_endpoint(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     project: Optional[Project] = Depends(get_project_from_header),
@@ -1277,7 +1446,6 @@ async def get_contributions_by_participant_endpoint(
     Shows accumulated historical contributions (for pie chart).
     """
     if not project:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=400,
             detail="X-Project-ID header is required",
@@ -1285,8 +1453,8 @@ async def get_contributions_by_participant_endpoint(
 
     contributions_data = get_contributions_by_participant(db, project.id)
 
-    return [
-        ContributionsByParticipant(
+    result = [
+        ContributionsByParticipant.model_construct(
             user_id=c["user_id"],
             user_name=c["user_name"],
             user_email=c["user_email"],
@@ -1297,3 +1465,4 @@ async def get_contributions_by_participant_endpoint(
         )
         for c in contributions_data
     ]
+    return Response(content=_contributions_list_adapter.dump_json(result), media_type="application/json")
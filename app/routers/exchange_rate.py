@@ -1,7 +1,7 @@
-from typing import List
+from typing import List, Optional
 from decimal import Decimal
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
@@ -10,13 +10,19 @@ from app.utils.dependencies import get_current_user
 from app.models.user import User
 from app.models.payment import ExchangeRateLog
 from app.services.exchange_rate import (
-    fetch_blue_dollar_rate_sync,
+    fetch_blue_dollar_rate,
     get_exchange_rate_history,
+    get_rate_fetched_at,
     log_exchange_rate,
 )
 
 router = APIRouter(prefix="/exchange-rate", tags=["Exchange Rate"])
 
+# How long clients may reuse /current before asking again
+CURRENT_RATE_MAX_AGE = 300
+# Fetch time of the last cached rate written to the exchange rate log
+_last_logged_fetch: Optional[datetime] = None
+
 
 class ExchangeRateResponse(BaseModel):
     rate: Decimal
@@ -36,21 +42,29 @@ class ExchangeRateHistoryItem(BaseModel):
 
 @router.get("/current", response_model=ExchangeRateResponse)
 async def get_current_exchange_rate(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Get the current blue dollar exchange rate.
+    Served from the exchange rate cache; each fetched rate is logged once.
     """
+    global _last_logged_fetch
     try:
-        rate = fetch_blue_dollar_rate_sync()
-        # Log the fetched rate
-        log_exchange_rate(db, rate, "bluelytics")
+        rate = await fetch_blue_dollar_rate()
+        fetched_at = get_rate_fetched_at()
+
+        # Log the fetched rate (once per fetch, not on every cache hit)
+        if fetched_at != _last_logged_fetch:
+            log_exchange_rate(db, rate, "bluelytics")
+            _last_logged_fetch = fetched_at
 
+        response.headers["Cache-Control"] = f"private, max-age={CURRENT_RATE_MAX_AGE}"
         return ExchangeRateResponse(
             rate=rate,
             source="bluelytics",
-            fetched_at=datetime.utcnow(),
+            fetched_at=fetched_at,
         )
     except Exception as e:
         raise HTTPException(
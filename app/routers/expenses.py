@@ -3,7 +3,7 @@ from decimal import Decimal
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from fastapi.responses import FileResponse, Response, RedirectResponse
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, raiseload
 from sqlalchemy import update as sa_update
 
 from app.database import get_db
@@ -46,12 +46,14 @@ async def list_expenses(
     import logging
     logger = logging.getLogger(__name__)
 
+    # Everything the response reads is eager-loaded; any other lazy load is a bug
     query = (
         db.query(Expense)
         .options(
             joinedload(Expense.provider),
             joinedload(Expense.category).joinedload(Category.rubro),
-            joinedload(Expense.rubro)
+            joinedload(Expense.rubro),
+            raiseload("*"),
         )
     )
 
@@ -88,21 +90,23 @@ async def list_expenses(
     # Batch-load all participant payments in one query (avoid N+1)
     expense_ids = [e.id for e in expenses]
     payments_by_expense: dict = {}
+    my_payment_by_expense: dict = {}
     if expense_ids:
         all_payments = db.query(ParticipantPayment).filter(
             ParticipantPayment.expense_id.in_(expense_ids),
             ParticipantPayment.is_deleted == False,
-        ).all()
+        ).options(raiseload("*")).all()
         for p in all_payments:
             payments_by_expense.setdefault(p.expense_id, []).append(p)
+            if p.user_id == current_user.id:
+                my_payment_by_expense.setdefault(p.expense_id, p)
 
     # Enrich expenses with payment tracking info (similar to contributions)
     enriched_expenses = []
     for expense in expenses:
         payments = payments_by_expense.get(expense.id, [])
 
-        # Find my payment
-        my_payment = next((p for p in payments if p.user_id == current_user.id), None)
+        my_payment = my_payment_by_expense.get(expense.id)
 
         # Calculate stats
         paid_count = sum(1 for p in payments if p.is_paid)
@@ -148,9 +152,14 @@ async def create_expense(
             detail="X-Project-ID header is required to create an expense",
         )
 
-    # Validate provider exists and belongs to project (if provided)
+    # Validate provider exists and belongs to project (if provided).
+    # Only the columns checked below are selected, not full ORM rows.
     if expense_data.provider_id:
-        provider = db.query(Provider).filter(Provider.id == expense_data.provider_id).first()
+        provider = (
+            db.query(Provider.is_active, Provider.project_id)
+            .filter(Provider.id == expense_data.provider_id)
+            .first()
+        )
         if not provider or not provider.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -164,7 +173,11 @@ async def create_expense(
 
     # Validate category exists and belongs to project (if provided)
     if expense_data.category_id:
-        category = db.query(Category).filter(Category.id == expense_data.category_id).first()
+        category = (
+            db.query(Category.is_active, Category.project_id)
+            .filter(Category.id == expense_data.category_id)
+            .first()
+        )
         if not category or not category.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -179,7 +192,11 @@ async def create_expense(
     # Validate rubro exists and belongs to project (if provided)
     if expense_data.rubro_id:
         from app.models.rubro import Rubro
-        rubro = db.query(Rubro).filter(Rubro.id == expense_data.rubro_id).first()
+        rubro = (
+            db.query(Rubro.is_active, Rubro.project_id)
+            .filter(Rubro.id == expense_data.rubro_id)
+            .first()
+        )
         if not rubro or not rubro.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -272,10 +289,10 @@ async def create_expense(
     # Update expense status based on auto-paid payments
     # (some payments may have been auto-paid from balance)
     update_expense_status(db, expense.id)
-    db.commit()
-    db.refresh(expense)
 
-    # Build response with payments — batch load users to avoid N+1
+    # Build payment summaries before committing, while the payment rows are
+    # still loaded — after commit each one would be re-selected on access.
+    # Users are batch loaded to avoid N+1.
     user_ids = [p.user_id for p in payments]
     users_by_id = {u.id: u for u in db.query(User).filter(User.id.in_(user_ids)).all()} if user_ids else {}
     payment_summaries = []
@@ -290,11 +307,14 @@ async def create_expense(
             paid_at=p.paid_at,
         ))
 
-    # Reload with relationships
+    expense_id = expense.id
+    db.commit()
+
+    # Reload with relationships (this also refreshes the expired expense)
     expense = (
         db.query(Expense)
         .options(joinedload(Expense.provider), joinedload(Expense.category), joinedload(Expense.rubro))
-        .filter(Expense.id == expense.id)
+        .filter(Expense.id == expense_id)
         .first()
     )
 
@@ -382,7 +402,8 @@ async def get_expense(
         .options(
             joinedload(Expense.provider),
             joinedload(Expense.category).joinedload(Category.rubro),
-            joinedload(Expense.rubro)
+            joinedload(Expense.rubro),
+            raiseload("*"),
         )
         .filter(Expense.id == expense_id)
         .first()
@@ -398,7 +419,7 @@ async def get_expense(
     payments = (
         db.query(ParticipantPayment)
         .filter(ParticipantPayment.expense_id == expense_id)
-        .options(joinedload(ParticipantPayment.user))
+        .options(joinedload(ParticipantPayment.user), raiseload("*"))
         .all()
     )
 
@@ -419,15 +440,16 @@ async def get_expense(
             is_paid=p.is_paid,
             paid_at=p.paid_at,
         ))
+        # Amounts are Numeric columns, so they already come back as Decimal
         if p.is_paid:
             paid_count += 1
-            total_paid_usd += Decimal(str(p.amount_due_usd))
+            total_paid_usd += p.amount_due_usd
             if p.amount_paid_usd:
-                total_actual_paid_usd += Decimal(str(p.amount_paid_usd))
+                total_actual_paid_usd += p.amount_paid_usd
             if p.amount_paid_ars:
-                total_actual_paid_ars += Decimal(str(p.amount_paid_ars))
+                total_actual_paid_ars += p.amount_paid_ars
         else:
-            total_pending_usd += Decimal(str(p.amount_due_usd))
+            total_pending_usd += p.amount_due_usd
 
     my_payment = next((p for p in payments if p.user_id == current_user.id), None)
     i_paid = my_payment.is_paid if my_payment else False
@@ -482,7 +504,13 @@ async def update_expense(
     Update an expense (project admin only).
     Note: Updating amount will NOT recalculate participant payments.
     """
-    expense = db.query(Expense).filter(Expense.id == expense_id).first()
+    # The project comes in the same SELECT: its currency_mode drives the conversion below
+    expense = (
+        db.query(Expense)
+        .options(joinedload(Expense.project))
+        .filter(Expense.id == expense_id)
+        .first()
+    )
     if not expense:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -507,8 +535,7 @@ async def update_expense(
         currency = update_data.get("currency_original", expense.currency_original)
 
         # Determine currency mode from project
-        project = db.query(Project).filter(Project.id == expense.project_id).first() if expense.project_id else None
-        currency_mode = getattr(project, 'currency_mode', 'DUAL') or 'DUAL'
+        currency_mode = getattr(expense.project, 'currency_mode', 'DUAL') or 'DUAL'
 
         if currency_mode in ("ARS", "USD"):
             if currency_mode == "ARS":
@@ -537,13 +564,12 @@ async def update_expense(
         sa_update(Expense).where(Expense.id == expense_id).values(**update_data)
     )
     db.commit()
-    db.refresh(expense)
 
-    # Reload with relationships
+    # Reload with relationships (this also refreshes the expired expense)
     expense = (
         db.query(Expense)
         .options(joinedload(Expense.provider), joinedload(Expense.category), joinedload(Expense.rubro))
-        .filter(Expense.id == expense.id)
+        .filter(Expense.id == expense_id)
         .first()
     )
 
@@ -662,13 +688,14 @@ async def delete_expense(
             detail="Only project admins can delete expenses",
         )
 
-    # Check for active payments (not deleted)
+    # Check for active payments (not deleted), with their users for the messages below
     active_payments = (
         db.query(ParticipantPayment)
         .filter(
             ParticipantPayment.expense_id == expense_id,
             ParticipantPayment.is_deleted == False,
         )
+        .options(joinedload(ParticipantPayment.user))
         .all()
     )
 
@@ -685,7 +712,7 @@ async def delete_expense(
             auto_delete_payments.append(payment)
             # Track paid payments for confirmation
             if payment.is_paid:
-                user = db.query(User).filter(User.id == payment.user_id).first()
+                user = payment.user
                 paid_payments_info.append({
                     "user_name": user.full_name if user else "Unknown",
                     "amount_usd": float(payment.amount_paid_usd) if payment.amount_paid_usd else 0,
@@ -814,71 +841,89 @@ async def mark_all_payments_as_paid(
     # Determine which currency to use for DUAL mode (default USD)
     dual_currency = data.currency or "USD"
 
-    pending_payments = db.query(ParticipantPayment).filter(
+    pending_filter = (
         ParticipantPayment.expense_id == expense_id,
         ParticipantPayment.is_paid == False,
         ParticipantPayment.is_pending_approval == False,
         ParticipantPayment.is_deleted == False,
-    ).all()
+    )
+    now = datetime.utcnow()
+    approval_values = {
+        "payment_date": data.payment_date or now,
+        "submitted_at": now,
+        "rejection_reason": None,
+        "is_pending_approval": False,
+        "is_paid": True,
+        "paid_at": now,
+        "approved_by": current_user.id,
+        "approved_at": now,
+    }
 
-    if not pending_payments:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No hay pagos pendientes para marcar",
+    if currency_mode in ("ARS", "USD"):
+        # Single currency: the paid amount is a copy of the amount due, so a
+        # single UPDATE marks every pending payment server-side
+        if currency_mode == "ARS":
+            amount_due = ParticipantPayment.amount_due_ars
+            amount_values = {"amount_paid_ars": amount_due, "amount_paid_usd": None}
+        else:
+            amount_due = ParticipantPayment.amount_due_usd
+            amount_values = {"amount_paid_usd": amount_due, "amount_paid_ars": None}
+        result = db.execute(
+            sa_update(ParticipantPayment)
+            .where(*pending_filter)
+            .values(
+                amount_paid=amount_due,
+                currency_paid=Currency(currency_mode),
+                exchange_rate_at_payment=None,
+                exchange_rate_source=None,
+                **amount_values,
+                **approval_values,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        marked_count = result.rowcount
+    else:
+        # DUAL: the converted amount is computed per payment, then all rows
+        # are written with one executemany UPDATE by primary key
+        pending_payments = (
+            db.query(ParticipantPayment.id, ParticipantPayment.amount_due_usd, ParticipantPayment.amount_due_ars)
+            .filter(*pending_filter)
+            .all()
         )
 
-    payment_date = data.payment_date or datetime.utcnow()
-    marked_count = 0
-
-    for payment in pending_payments:
-        if currency_mode == "ARS":
-            amount = payment.amount_due_ars
-            payment.amount_paid = amount
-            payment.currency_paid = Currency.ARS
-            payment.amount_paid_ars = amount
-            payment.amount_paid_usd = None
-            payment.exchange_rate_at_payment = None
-            payment.exchange_rate_source = None
-        elif currency_mode == "USD":
-            amount = payment.amount_due_usd
-            payment.amount_paid = amount
-            payment.currency_paid = Currency.USD
-            payment.amount_paid_usd = amount
-            payment.amount_paid_ars = None
-            payment.exchange_rate_at_payment = None
-            payment.exchange_rate_source = None
-        else:  # DUAL
+        # Parse the conversion rate once instead of once per payment
+        tc_dec = Decimal(str(tc)) if tc and tc > 0 else None
+        cents = Decimal("0.01")
+
+        rows = []
+        for payment_id, amount_due_usd, amount_due_ars in pending_payments:
+            row = {
+                "id": payment_id,
+                "exchange_rate_at_payment": tc,
+                "exchange_rate_source": tc_source,
+                **approval_values,
+            }
             if dual_currency == "ARS":
-                amount = payment.amount_due_ars
-                payment.currency_paid = Currency.ARS
-            else:
-                amount = payment.amount_due_usd
-                payment.currency_paid = Currency.USD
-            payment.amount_paid = amount
-            payment.exchange_rate_at_payment = tc
-            payment.exchange_rate_source = tc_source
-            if tc and tc > 0:
-                if dual_currency == "USD":
-                    payment.amount_paid_usd = amount
-                    payment.amount_paid_ars = (Decimal(str(amount)) * Decimal(str(tc))).quantize(Decimal("0.01"))
-                else:
-                    payment.amount_paid_ars = amount
-                    payment.amount_paid_usd = (Decimal(str(amount)) / Decimal(str(tc))).quantize(Decimal("0.01"))
+                row["amount_paid"] = row["amount_paid_ars"] = amount_due_ars
+                row["currency_paid"] = Currency.ARS
+                if tc_dec:
+                    row["amount_paid_usd"] = (amount_due_ars / tc_dec).quantize(cents)
             else:
-                if dual_currency == "USD":
-                    payment.amount_paid_usd = amount
-                else:
-                    payment.amount_paid_ars = amount
-
-        payment.payment_date = payment_date
-        payment.submitted_at = datetime.utcnow()
-        payment.rejection_reason = None
-        payment.is_pending_approval = False
-        payment.is_paid = True
-        payment.paid_at = datetime.utcnow()
-        payment.approved_by = current_user.id
-        payment.approved_at = datetime.utcnow()
-        marked_count += 1
+                row["amount_paid"] = row["amount_paid_usd"] = amount_due_usd
+                row["currency_paid"] = Currency.USD
+                if tc_dec:
+                    row["amount_paid_ars"] = (amount_due_usd * tc_dec).quantize(cents)
+            rows.append(row)
+
+        if rows:
+            db.execute(sa_update(ParticipantPayment), rows)
+        marked_count = len(rows)
+
+    if not marked_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No hay pagos pendientes para marcar",
+        )
 
     db.commit()
     update_expense_status(db, expense_id)
@@ -1,6 +1,7 @@
 from typing import List
 from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -34,10 +35,10 @@ def auto_update_project_mode(db: Session, project_id: int):
     if not project:
         return
 
-    active_members_count = db.query(ProjectMember).filter(
+    active_members_count = db.query(func.count(ProjectMember.id)).filter(
         ProjectMember.project_id == project_id,
         ProjectMember.is_active == True
-    ).count()
+    ).scalar()
 
     # If more than 1 member, project should be multi-participant
     if active_members_count > 1 and project.is_individual:
@@ -625,11 +626,11 @@ async def update_project_member(
 
     # Prevent removing admin role if this is the last admin
     if "is_admin" in update_data and not update_data["is_admin"] and member.is_admin:
-        admin_count = db.query(ProjectMember).filter(
+        admin_count = db.query(func.count(ProjectMember.id)).filter(
             ProjectMember.project_id == project_id,
             ProjectMember.is_admin == True,
             ProjectMember.is_active == True,
-        ).count()
+        ).scalar()
         if admin_count <= 1:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -693,11 +694,11 @@ async def remove_project_member(
 
     # Prevent removing the last admin
     if member.is_admin:
-        admin_count = db.query(ProjectMember).filter(
+        admin_count = db.query(func.count(ProjectMember.id)).filter(
             ProjectMember.project_id == project_id,
             ProjectMember.is_admin == True,
             ProjectMember.is_active == True,
-        ).count()
+        ).scalar()
         if admin_count <= 1:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
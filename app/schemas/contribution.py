@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, AliasChoices, AliasPath
 from decimal import Decimal
 from datetime import datetime
 from typing import Optional, List
@@ -60,10 +60,20 @@ class ContributionWithDetails(ContributionResponse):
 
 
 class ContributionWithMyPayment(ContributionResponse):
-    """Contribution with current user's payment info"""
-    created_by_name: Optional[str] = None
-    created_by_email: Optional[str] = None
-    contributor_name: Optional[str] = None  # For unilateral: who contributed
+    """Contribution with current user's payment info.
+
+    When validated from a Contribution row, the creator/contributor names are
+    read from the loaded relationships via AliasPath.
+    """
+    created_by_name: Optional[str] = Field(
+        None, validation_alias=AliasChoices("created_by_name", AliasPath("created_by_user", "full_name"))
+    )
+    created_by_email: Optional[str] = Field(
+        None, validation_alias=AliasChoices("created_by_email", AliasPath("created_by_user", "email"))
+    )
+    contributor_name: Optional[str] = Field(  # For unilateral: who contributed
+        None, validation_alias=AliasChoices("contributor_name", AliasPath("contributor_user", "full_name"))
+    )
     my_payment_id: Optional[int] = None  # ID del pago del usuario actual
     my_amount_due: Decimal = Decimal("0")  # Cuánto debe pagar el usuario actual
     my_amount_offset: Decimal = Decimal("0")  # Discount from unilateral contributions
@@ -76,6 +86,7 @@ class ContributionWithMyPayment(ContributionResponse):
 
     class Config:
         from_attributes = True
+        populate_by_name = True
 
 
 class ContributionPaymentDetail(BaseModel):
@@ -114,3 +114,9 @@ class ExpenseByRubro(BaseModel):
     total_usd: Decimal
     total_ars: Decimal
     expenses_count: int
+
+
+class ExpensesBreakdown(BaseModel):
+    by_provider: List[ExpenseByProvider]
+    by_category: List[ExpenseByCategory]
+    by_rubro: List[ExpenseByRubro]
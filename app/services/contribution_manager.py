@@ -1,8 +1,8 @@
 from decimal import Decimal
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, and_
 
 from app.models.contribution import Contribution, ContributionStatus
 from app.models.project_member import ProjectMember
@@ -203,7 +203,7 @@ def get_member_balance(
         }
 
     # Get project to determine currency mode
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.get(Project, project_id)
     currency_mode = getattr(project, 'currency_mode', 'DUAL') or 'DUAL'
 
     if currency_mode == "DUAL":
@@ -229,15 +229,17 @@ def get_all_member_balances(
 
     For DUAL mode, calculates USD equivalent in real-time using current exchange rate.
     """
+    # Balances are kept up to date on ProjectMember; load users in the same query
     members = (
         db.query(ProjectMember)
+        .options(joinedload(ProjectMember.user))
         .filter(ProjectMember.project_id == project_id)
         .filter(ProjectMember.is_active == True)
         .all()
     )
 
     # Get project to determine currency mode
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.get(Project, project_id)
     currency_mode = getattr(project, 'currency_mode', 'DUAL') or 'DUAL'
 
     # Get current exchange rate if DUAL mode
@@ -248,13 +250,20 @@ def get_all_member_balances(
         except:
             current_tc = Decimal("1000")  # Fallback
 
+    # Resolve the DUAL conversion once for all members
+    convert_usd = currency_mode == "DUAL" and current_tc
+    usd_rate = current_tc if convert_usd and current_tc > 0 else None
+    cents = Decimal("0.01")
+
     result = []
     for member in members:
         # Calculate USD equivalent for DUAL mode
-        if currency_mode == "DUAL" and current_tc:
-            balance_usd = (member.balance_ars / current_tc).quantize(Decimal("0.01")) if current_tc > 0 else Decimal("0")
-        else:
+        if not convert_usd:
             balance_usd = member.balance_usd
+        elif usd_rate:
+            balance_usd = (member.balance_ars / usd_rate).quantize(cents)
+        else:
+            balance_usd = Decimal("0")
 
         result.append({
             "user_id": member.user_id,
@@ -280,10 +289,14 @@ def get_contributions_by_participant(
     """
     from sqlalchemy import case
 
-    # Query approved contributions grouped by user (using created_by, not user_id)
+    # Query approved contributions grouped by user (using created_by, not user_id),
+    # with the contributor's name, email and participation joined in the same query
     results = (
         db.query(
             Contribution.created_by.label("user_id"),
+            User.full_name.label("user_name"),
+            User.email.label("user_email"),
+            ProjectMember.participation_percentage,
             func.sum(case(
                 (Contribution.currency == Currency.USD, Contribution.amount),
                 else_=0
@@ -294,9 +307,19 @@ def get_contributions_by_participant(
             )).label("total_ars"),
             func.count(Contribution.id).label("contributions_count"),
         )
+        .outerjoin(User, User.id == Contribution.created_by)
+        .outerjoin(ProjectMember, and_(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id == Contribution.created_by,
+        ))
         .filter(Contribution.project_id == project_id)
         .filter(Contribution.status == ContributionStatus.APPROVED)
-        .group_by(Contribution.created_by)
+        .group_by(
+            Contribution.created_by,
+            User.full_name,
+            User.email,
+            ProjectMember.participation_percentage,
+        )
         .all()
     )
 
@@ -312,25 +335,29 @@ def get_contributions_by_participant(
         except:
             current_tc = Decimal("1000")  # Fallback
 
+    # Resolve the DUAL conversion once for all participants
+    convert_usd = currency_mode == "DUAL" and current_tc
+    usd_rate = current_tc if convert_usd and current_tc > 0 else None
+    cents = Decimal("0.01")
+
     output = []
     for row in results:
-        user = db.query(User).filter(User.id == row.user_id).first()
-        member = db.query(ProjectMember).filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == row.user_id,
-        ).first()
-
         # Calculate USD equivalent for DUAL mode
-        if currency_mode == "DUAL" and current_tc:
-            total_usd = (row.total_ars / current_tc).quantize(Decimal("0.01")) if current_tc > 0 else Decimal("0")
-        else:
+        if not convert_usd:
             total_usd = row.total_usd or Decimal("0")
+        elif usd_rate:
+            total_usd = (row.total_ars / usd_rate).quantize(cents)
+        else:
+            total_usd = Decimal("0")
 
         output.append({
             "user_id": row.user_id,
-            "user_name": user.full_name if user else "Unknown",
-            "user_email": user.email if user else "",
-            "participation_percentage": member.participation_percentage if member else Decimal("0"),
+            "user_name": row.user_name if row.user_name is not None else "Unknown",
+            "user_email": row.user_email if row.user_email is not None else "",
+            "participation_percentage": (
+                row.participation_percentage
+                if row.participation_percentage is not None else Decimal("0")
+            ),
             "total_usd": total_usd,
             "total_ars": row.total_ars or Decimal("0"),
             "contributions_count": row.contributions_count or 0,
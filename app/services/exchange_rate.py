@@ -1,3 +1,5 @@
+import asyncio
+import threading
 from decimal import Decimal
 from datetime import datetime, timedelta
 from typing import Optional
@@ -12,18 +14,75 @@ settings = get_settings()
 # Cache for exchange rate
 _cached_rate: Optional[Decimal] = None
 _cache_timestamp: Optional[datetime] = None
+# After a failed refresh, keep serving the stale rate until this time instead of
+# retrying the API (and waiting out its timeout) on every request.
+_retry_after: Optional[datetime] = None
+_FAILED_REFRESH_BACKOFF = timedelta(minutes=1)
+# Only one refresh in flight at a time: concurrent callers that find the cache
+# expired wait for it and then read the fresh rate instead of each calling the API.
+_async_refresh_lock = asyncio.Lock()
+_sync_refresh_lock = threading.Lock()
+_refresh_attempts = 0
+
+
+def _get_cached_rate() -> Optional[Decimal]:
+    """Return the cached rate if it is fresh (or we are backing off), else None."""
+    if not (_cached_rate and _cache_timestamp):
+        return None
+    now = datetime.utcnow()
+    if now - _cache_timestamp < timedelta(minutes=settings.exchange_rate_cache_minutes):
+        return _cached_rate
+    if _retry_after and now < _retry_after:
+        return _cached_rate
+    return None
+
+
+def get_rate_fetched_at() -> Optional[datetime]:
+    """Return when the cached rate was last fetched from the API (None if never)."""
+    return _cache_timestamp
+
+
+def _store_rate(rate: Decimal) -> None:
+    global _cached_rate, _cache_timestamp, _retry_after
+    _cached_rate = rate
+    _cache_timestamp = datetime.utcnow()
+    _retry_after = None
+
+
+def _stale_rate_after_failure() -> Optional[Decimal]:
+    """On a failed refresh, back off and return the stale rate if we have one."""
+    global _retry_after
+    if _cached_rate:
+        _retry_after = datetime.utcnow() + _FAILED_REFRESH_BACKOFF
+    return _cached_rate
+
+
+def _raise_if_refresh_failed_while_waiting(attempt: int) -> None:
+    """Fail fast if the refresh we waited on failed, rather than retrying it serially."""
+    if _refresh_attempts != attempt:
+        raise Exception("Failed to fetch exchange rate: refresh already failed")
 
 
 async def fetch_blue_dollar_rate() -> Decimal:
     """Fetch the current blue dollar rate from bluelytics API."""
-    global _cached_rate, _cache_timestamp
-
     # Check cache
-    if _cached_rate and _cache_timestamp:
-        cache_age = datetime.utcnow() - _cache_timestamp
-        if cache_age < timedelta(minutes=settings.exchange_rate_cache_minutes):
-            return _cached_rate
-
+    cached = _get_cached_rate()
+    if cached:
+        return cached
+
+    attempt = _refresh_attempts
+    async with _async_refresh_lock:
+        # Another request may have refreshed the rate while we waited
+        cached = _get_cached_rate()
+        if cached:
+            return cached
+        _raise_if_refresh_failed_while_waiting(attempt)
+        return await _refresh_blue_dollar_rate()
+
+
+async def _refresh_blue_dollar_rate() -> Decimal:
+    global _refresh_attempts
+    _refresh_attempts += 1
     try:
         async with httpx.AsyncClient() as client:
             response = await client.get(
@@ -37,29 +96,39 @@ async def fetch_blue_dollar_rate() -> Decimal:
             blue_rate = Decimal(str(data["blue"]["value_sell"]))
 
             # Update cache
-            _cached_rate = blue_rate
-            _cache_timestamp = datetime.utcnow()
+            _store_rate(blue_rate)
 
             return blue_rate
 
     except Exception as e:
         # If fetch fails and we have a cached rate, use it
-        if _cached_rate:
-            return _cached_rate
+        stale = _stale_rate_after_failure()
+        if stale:
+            return stale
         # Default fallback rate (should be updated)
         raise Exception(f"Failed to fetch exchange rate: {e}")
 
 
 def fetch_blue_dollar_rate_sync() -> Decimal:
     """Synchronous version for non-async contexts."""
-    global _cached_rate, _cache_timestamp
-
     # Check cache
-    if _cached_rate and _cache_timestamp:
-        cache_age = datetime.utcnow() - _cache_timestamp
-        if cache_age < timedelta(minutes=settings.exchange_rate_cache_minutes):
-            return _cached_rate
-
+    cached = _get_cached_rate()
+    if cached:
+        return cached
+
+    attempt = _refresh_attempts
+    with _sync_refresh_lock:
+        # Another thread may have refreshed the rate while we waited
+        cached = _get_cached_rate()
+        if cached:
+            return cached
+        _raise_if_refresh_failed_while_waiting(attempt)
+        return _refresh_blue_dollar_rate_sync()
+
+
+def _refresh_blue_dollar_rate_sync() -> Decimal:
+    global _refresh_attempts
+    _refresh_attempts += 1
     try:
         with httpx.Client() as client:
             response = client.get(
@@ -71,14 +140,14 @@ def fetch_blue_dollar_rate_sync() -> Decimal:
 
             blue_rate = Decimal(str(data["blue"]["value_sell"]))
 
-            _cached_rate = blue_rate
-            _cache_timestamp = datetime.utcnow()
+            _store_rate(blue_rate)
 
             return blue_rate
 
     except Exception as e:
-        if _cached_rate:
-            return _cached_rate
+        stale = _stale_rate_after_failure()
+        if stale:
+            return stale
         raise Exception(f"Failed to fetch exchange rate: {e}")
 
 
@@ -1,6 +1,7 @@
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
+from sqlalchemy import func, case
 from sqlalchemy.orm import Session
 
 from app.models.user import User
@@ -507,6 +508,74 @@ def get_user_pending_payments(db: Session, user_id: int) -> List[ParticipantPaym
     )
 
 
+def _empty_payment_summary() -> dict:
+    return {
+        "total_due_usd": Decimal("0"),
+        "total_due_ars": Decimal("0"),
+        "total_paid_usd": Decimal("0"),
+        "total_paid_ars": Decimal("0"),
+        "pending_usd": Decimal("0"),
+        "pending_ars": Decimal("0"),
+        "pending_payments_count": 0,
+    }
+
+
+def get_payment_summaries_for_users(
+    db: Session,
+    user_ids: Iterable[int],
+    project_id: Optional[int] = None,
+) -> Dict[int, dict]:
+    """
+    Batched get_user_payment_summary: one GROUP BY user_id query for many users.
+    Returns {user_id: summary}; users without expense payments get zero totals.
+    """
+    user_ids = list(user_ids)
+    summaries = {user_id: _empty_payment_summary() for user_id in user_ids}
+    if not user_ids:
+        return summaries
+
+    paid = ParticipantPayment.is_paid == True
+    query = (
+        db.query(
+            ParticipantPayment.user_id,
+            func.sum(ParticipantPayment.amount_due_usd).label("total_due_usd"),
+            func.sum(ParticipantPayment.amount_due_ars).label("total_due_ars"),
+            func.sum(case((paid, ParticipantPayment.amount_due_usd), else_=0)).label("total_paid_usd"),
+            func.sum(case((paid, ParticipantPayment.amount_due_ars), else_=0)).label("total_paid_ars"),
+            func.sum(case((paid, 0), else_=1)).label("pending_count"),
+        )
+        .join(Expense, ParticipantPayment.expense_id == Expense.id)
+        .filter(
+            ParticipantPayment.user_id.in_(user_ids),
+            ParticipantPayment.is_deleted == False,
+            Expense.is_deleted == False,
+        )
+    )
+    if project_id:
+        query = query.filter(Expense.project_id == project_id)
+
+    def as_decimal(value) -> Decimal:
+        # Keep the column scale ("0.00"); `value or 0` would collapse it to "0"
+        return value if value is not None else Decimal("0")
+
+    for row in query.group_by(ParticipantPayment.user_id).all():
+        total_due_usd = as_decimal(row.total_due_usd)
+        total_due_ars = as_decimal(row.total_due_ars)
+        total_paid_usd = as_decimal(row.total_paid_usd)
+        total_paid_ars = as_decimal(row.total_paid_ars)
+        summaries[row.user_id] = {
+            "total_due_usd": total_due_usd,
+            "total_due_ars": total_due_ars,
+            "total_paid_usd": total_paid_usd,
+            "total_paid_ars": total_paid_ars,
+            "pending_usd": total_due_usd - total_paid_usd,
+            "pending_ars": total_due_ars - total_paid_ars,
+            "pending_payments_count": int(row.pending_count or 0),
+        }
+
+    return summaries
+
+
 def get_user_payment_summary(db: Session, user_id: int, project_id: Optional[int] = None) -> dict:
     """
     Get payment summary for a user, optionally filtered by project.
@@ -514,46 +583,7 @@ def get_user_payment_summary(db: Session, user_id: int, project_id: Optional[int
     Contribution payments are tracked separately via balance_aportes.
     Excludes deleted payments and expenses.
     """
-    # Query ParticipantPayment (expense payments ONLY)
-    expense_payments_query = db.query(ParticipantPayment).filter(
-        ParticipantPayment.user_id == user_id,
-        ParticipantPayment.is_deleted == False,
-    )
-
-    if project_id:
-        expense_payments_query = expense_payments_query.join(Expense).filter(
-            Expense.project_id == project_id,
-            Expense.is_deleted == False,
-        )
-    else:
-        # Even without project filter, exclude deleted expenses
-        expense_payments_query = expense_payments_query.join(Expense).filter(Expense.is_deleted == False)
-
-    expense_payments = expense_payments_query.all()
-
-    # Sum expense payments (have amount_due_usd and amount_due_ars)
-    total_due_usd = sum(Decimal(str(p.amount_due_usd)) for p in expense_payments)
-    total_due_ars = sum(Decimal(str(p.amount_due_ars)) for p in expense_payments)
-
-    paid_expense_payments = [p for p in expense_payments if p.is_paid]
-    total_paid_usd = sum(Decimal(str(p.amount_due_usd)) for p in paid_expense_payments)
-    total_paid_ars = sum(Decimal(str(p.amount_due_ars)) for p in paid_expense_payments)
-
     # NOTE: Contributions are NOT included in pending calculations
     # Contributions are credits (user adds money to fund), not debts
     # They are tracked separately via balance_aportes in ProjectMember
-
-    pending_usd = total_due_usd - total_paid_usd
-    pending_ars = total_due_ars - total_paid_ars
-
-    total_pending_count = len([p for p in expense_payments if not p.is_paid])
-
-    return {
-        "total_due_usd": total_due_usd,
-        "total_due_ars": total_due_ars,
-        "total_paid_usd": total_paid_usd,
-        "total_paid_ars": total_paid_ars,
-        "pending_usd": pending_usd,
-        "pending_ars": pending_ars,
-        "pending_payments_count": total_pending_count,
-    }
+    return get_payment_summaries_for_users(db, [user_id], project_id)[user_id]
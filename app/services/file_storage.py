@@ -4,6 +4,7 @@ import shutil
 from pathlib import Path
 from typing import Optional
 from fastapi import UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.config import get_settings
 
@@ -72,22 +73,66 @@ def is_url(path: str) -> bool:
     return path.startswith("http://") or path.startswith("https://")
 
 
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+class _NonClosingReader:
+    """
+    Read-only view of an upload's file that ignores close().
+    upload_large() reads its stream inside ``with file_io:``, which would
+    otherwise close the UploadFile's underlying file.
+    """
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def read(self, size: int = -1) -> bytes:
+        return self._raw.read(size)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._raw.tell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
 async def upload_to_cloudinary(file: UploadFile, folder: str, public_id: str) -> str:
     """Upload file to Cloudinary and return the URL."""
     try:
         await file.seek(0)
-        contents = await file.read()
-        result = cloudinary.uploader.upload(
-            contents,
+        # Hand Cloudinary the underlying file object so it reads it in chunks
+        # instead of us loading the whole upload into memory first. The chunked
+        # upload makes blocking HTTP requests, so it runs off the event loop.
+        result = await run_in_threadpool(
+            cloudinary.uploader.upload_large,
+            _NonClosingReader(file.file),
             folder=f"construccion/{folder}",
             public_id=public_id,
             resource_type="raw",
+            chunk_size=6_000_000,
         )
         return result["secure_url"]
     finally:
         await file.seek(0)
 
 
+async def write_upload_to_disk(file: UploadFile, file_path: Path) -> None:
+    """Copy an upload to disk in fixed-size chunks, then close it."""
+    try:
+        await file.seek(0)
+        with open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+    finally:
+        await file.close()
+
+
 async def save_invoice(file: UploadFile, expense_id: int) -> str:
     """
     Save an invoice file and return the path/URL.
@@ -106,13 +151,7 @@ async def save_invoice(file: UploadFile, expense_id: int) -> str:
     else:
         # Local storage fallback
         file_path = get_invoices_dir() / f"expense_{expense_id}_{filename}"
-        try:
-            await file.seek(0)
-            contents = await file.read()
-            with open(file_path, "wb") as buffer:
-                buffer.write(contents)
-        finally:
-            await file.close()
+        await write_upload_to_disk(file, file_path)
         return str(file_path.relative_to(get_upload_dir().parent))
 
 
@@ -134,13 +173,7 @@ async def save_receipt(file: UploadFile, payment_id: int) -> str:
     else:
         # Local storage fallback
         file_path = get_receipts_dir() / f"payment_{payment_id}_{filename}"
-        try:
-            await file.seek(0)
-            contents = await file.read()
-            with open(file_path, "wb") as buffer:
-                buffer.write(contents)
-        finally:
-            await file.close()
+        await write_upload_to_disk(file, file_path)
         return str(file_path.relative_to(get_upload_dir().parent))
 
 
@@ -162,13 +195,7 @@ async def save_contribution_receipt(file: UploadFile, contribution_id: int) -> s
     else:
         # Local storage fallback
         file_path = get_receipts_dir() / f"contribution_{contribution_id}_{filename}"
-        try:
-            await file.seek(0)
-            contents = await file.read()
-            with open(file_path, "wb") as buffer:
-                buffer.write(contents)
-        finally:
-            await file.close()
+        await write_upload_to_disk(file, file_path)
         return str(file_path.relative_to(get_upload_dir().parent))
 
 
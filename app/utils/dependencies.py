@@ -1,6 +1,7 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -72,14 +73,16 @@ async def get_project_from_header(
             detail="Project not found",
         )
 
-    # Check if user is a member of this project
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == x_project_id,
-        ProjectMember.user_id == current_user.id,
-        ProjectMember.is_active == True
-    ).first()
+    # Check if user is a member of this project (EXISTS, no row hydration)
+    is_member = db.query(
+        exists().where(
+            ProjectMember.project_id == x_project_id,
+            ProjectMember.user_id == current_user.id,
+            ProjectMember.is_active == True,
+        )
+    ).scalar()
 
-    if not member:
+    if not is_member:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not a member of this project",
@@ -127,13 +130,7 @@ async def get_project_admin_user(
         )
 
     # Check if user is an admin of this project
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == x_project_id,
-        ProjectMember.user_id == current_user.id,
-        ProjectMember.is_active == True
-    ).first()
-
-    if not member or not member.is_admin:
+    if not is_project_admin(db, current_user.id, x_project_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You must be an admin of this project",
@@ -142,15 +139,24 @@ async def get_project_admin_user(
     return current_user
 
 
+def is_admin_member(member: Optional[ProjectMember]) -> bool:
+    """
+    Check admin status from an already-loaded ProjectMember row.
+    Same rule as is_project_admin, for callers that fetched the member in a join.
+    """
+    return bool(member and member.is_active and member.is_admin)
+
+
 def is_project_admin(db: Session, user_id: int, project_id: int) -> bool:
     """
     Helper function to check if a user is an admin of a project.
     Returns True if the user is an admin of the project.
     """
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == user_id,
-        ProjectMember.is_active == True,
-        ProjectMember.is_admin == True
-    ).first()
-    return member is not None
+    return db.query(
+        exists().where(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id == user_id,
+            ProjectMember.is_active == True,
+            ProjectMember.is_admin == True,
+        )
+    ).scalar()
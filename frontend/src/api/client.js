@@ -179,6 +179,7 @@ export const dashboardAPI = {
   expensesByProvider: (params = {}) => client.get('/dashboard/expenses-by-provider', { params }),
   expensesByCategory: (params = {}) => client.get('/dashboard/expenses-by-category', { params }),
   expensesByRubro: (params = {}) => client.get('/dashboard/expenses-by-rubro', { params }),
+  expensesBreakdown: (params = {}) => client.get('/dashboard/expenses-breakdown', { params }),
   balances: () => client.get('/dashboard/balances'),
   contributionsByParticipant: () => client.get('/dashboard/contributions-by-participant'),
 }
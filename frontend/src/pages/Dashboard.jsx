@@ -81,13 +81,12 @@ function Dashboard() {
       setLoading(true)
       const params = getDateParams()
 
-      const [summaryRes, myStatusRes, evolutionRes, rateRes, categoryRes, rubroRes, balancesRes, avanceRes] = await Promise.all([
+      const [summaryRes, myStatusRes, evolutionRes, rateRes, breakdownRes, balancesRes, avanceRes] = await Promise.all([
         dashboardAPI.summary(params),
         dashboardAPI.myStatus(),
         dashboardAPI.evolution(params),
         exchangeRateAPI.current().catch(() => null),
-        dashboardAPI.expensesByCategory(params),
-        dashboardAPI.expensesByRubro(params),
+        dashboardAPI.expensesBreakdown(params),
         dashboardAPI.balances().catch(() => ({ data: [] })),
         avanceObraAPI.list().catch(() => ({ data: [] })),
       ])
@@ -95,8 +94,8 @@ function Dashboard() {
       setSummary(summaryRes.data)
       setMyStatus(myStatusRes.data)
       setEvolution(evolutionRes.data)
-      setByCategory(categoryRes.data)
-      setByRubro(rubroRes.data)
+      setByCategory(breakdownRes.data.by_category)
+      setByRubro(breakdownRes.data.by_rubro)
       setBalances(balancesRes.data || [])
       setAvanceData(avanceRes.data || [])
       if (rateRes) setExchangeRate(rateRes.data)
@@ -0,0 +1,287 @@
+"""
+Test E2E — Escenario 04: Solicitudes de aporte · Absorción y auto-aprobación
+
+Verifica el flujo descripto en:
+  tests/scenarios/04_solicitudes_absorcion_y_aprobacion.md
+
+Casos cubiertos:
+  A — Solicitud grupal que absorbe un aporte unilateral: split por %, offset,
+      auto-pago de la cuota totalmente cubierta y datos del listado.
+  B — Envío de pago de solicitud: admin (auto-aprobado), no admin en proyecto
+      compartido (pendiente de aprobación) y no admin en proyecto individual
+      (auto-aprobado).
+  C — Descarga de comprobante: miembros del proyecto pueden pedirlo, un
+      usuario ajeno al proyecto recibe 403.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.database import SessionLocal
+from app.models.contribution_payment import ContributionPayment
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def register_and_login(client, email, full_name, admin_headers=None):
+    """Registra un usuario (el primero como admin global) y devuelve (id, headers)."""
+    if admin_headers is None:
+        r = client.post("/auth/register-first-admin", json={
+            "email": email,
+            "password": "Test1234!",
+            "full_name": full_name,
+        })
+    else:
+        r = client.post("/auth/register", json={
+            "email": email,
+            "password": "Test1234!",
+            "full_name": full_name,
+        }, headers=admin_headers)
+    assert r.status_code == 201, f"register {email}: {r.text}"
+    user_id = r.json()["id"]
+
+    r = client.post("/auth/login", data={"username": email, "password": "Test1234!"})
+    assert r.status_code == 200, f"login {email}: {r.text}"
+    return user_id, {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def create_ars_project(client, headers, name):
+    r = client.post("/projects", json={"name": name, "currency_mode": "ARS"}, headers=headers)
+    assert r.status_code == 200, f"create project: {r.text}"
+    return r.json()["id"]
+
+
+def setup_shared_project(client):
+    """Proyecto ARS compartido: U1 admin 70%, U2 miembro 30%."""
+    u1_id, h1 = register_and_login(client, "u1@escenario04.com", "Usuario 1")
+    u2_id, h2 = register_and_login(client, "u2@escenario04.com", "Usuario 2", admin_headers=h1)
+
+    project_id = create_ars_project(client, h1, "Proyecto Escenario 04")
+    h1p = {**h1, "X-Project-ID": str(project_id)}
+    h2p = {**h2, "X-Project-ID": str(project_id)}
+
+    r = client.put(f"/projects/{project_id}/members/{u1_id}", json={
+        "participation_percentage": 70,
+    }, headers=h1p)
+    assert r.status_code == 200, f"update u1 percentage: {r.text}"
+
+    r = client.post(f"/projects/{project_id}/members", json={
+        "user_id": u2_id,
+        "participation_percentage": 30,
+    }, headers=h1p)
+    assert r.status_code == 200, f"add member: {r.text}"
+
+    return project_id, (u1_id, h1, h1p), (u2_id, h2, h2p)
+
+
+def payments_by_user(contribution_id):
+    """Lee de la BD los ContributionPayment de una solicitud, indexados por user_id."""
+    db = SessionLocal()
+    try:
+        rows = db.query(ContributionPayment).filter(
+            ContributionPayment.contribution_id == contribution_id
+        ).all()
+        return {p.user_id: p for p in rows}
+    finally:
+        db.close()
+
+
+def set_is_individual(project_id, value):
+    db = SessionLocal()
+    try:
+        db.query(Project).filter(Project.id == project_id).update({"is_individual": value})
+        db.commit()
+    finally:
+        db.close()
+
+
+def member_balance_ars(project_id, user_id):
+    db = SessionLocal()
+    try:
+        member = db.query(ProjectMember).filter(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id == user_id,
+        ).first()
+        return Decimal(str(member.balance_ars))
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Caso A: absorción de aporte unilateral
+# ---------------------------------------------------------------------------
+
+def test_solicitud_absorbe_aporte_unilateral(client):
+    project_id, (u1_id, _, h1p), (u2_id, _, h2p) = setup_shared_project(client)
+
+    # U1 (admin) hace un aporte unilateral de ARS 100.000 → auto-aprobado
+    r = client.post("/contributions/unilateral", json={
+        "description": "Aporte directo U1",
+        "amount": "100000.00",
+        "currency": "ARS",
+    }, headers=h1p)
+    assert r.status_code == 201, f"unilateral: {r.text}"
+    unilateral_id = r.json()["id"]
+    assert r.json()["status"] == "approved"
+
+    # Solicitud grupal ARS 100.000 que absorbe el unilateral de U1
+    r = client.post("/contributions", json={
+        "description": "Solicitud con absorción",
+        "amount": "100000.00",
+        "currency": "ARS",
+        "absorb_unilateral_ids": [unilateral_id],
+    }, headers=h1p)
+    assert r.status_code == 201, f"create contribution: {r.text}"
+    solicitud_id = r.json()["id"]
+
+    payments = payments_by_user(solicitud_id)
+    assert set(payments) == {u1_id, u2_id}
+
+    # U1: cuota 70.000 totalmente cubierta por el unilateral → pagada sin efectivo
+    p1 = payments[u1_id]
+    assert p1.amount_due == Decimal("70000.00")
+    assert p1.amount_offset == Decimal("70000.00")
+    assert p1.is_paid is True
+    assert p1.amount_paid == Decimal("70000.00")
+    assert p1.amount_paid_ars == Decimal("70000.00")
+    assert p1.amount_paid_usd == Decimal("0")
+    assert p1.currency_paid == "ARS"
+    assert p1.approved_by == u1_id
+
+    # U2: cuota 30.000 sin absorción → pendiente con los defaults de la columna
+    p2 = payments[u2_id]
+    assert p2.amount_due == Decimal("30000.00")
+    assert p2.amount_offset == Decimal("0")
+    assert p2.is_paid is False
+    assert p2.paid_at is None
+    assert p2.amount_paid_ars == Decimal("0")
+
+    # El unilateral queda con 30.000 disponibles
+    r = client.get("/contributions/unilateral/unabsorbed", headers=h1p)
+    assert r.status_code == 200, f"unabsorbed: {r.text}"
+    unabsorbed = {u["id"]: u for u in r.json()}
+    assert Decimal(unabsorbed[unilateral_id]["remaining"]) == Decimal("30000.00")
+
+    # Listado: cada solicitud aparece una vez, con conteos y datos del usuario actual
+    r = client.get("/contributions", headers=h1p)
+    assert r.status_code == 200, f"list u1: {r.text}"
+    listed = r.json()
+    assert [c["id"] for c in listed].count(solicitud_id) == 1
+    s1 = next(c for c in listed if c["id"] == solicitud_id)
+    assert s1["created_by_name"] == "Usuario 1"
+    assert s1["total_participants"] == 2
+    assert s1["paid_participants"] == 1
+    assert s1["is_complete"] is False
+    assert s1["i_paid"] is True
+    assert Decimal(s1["my_amount_due"]) == Decimal("70000.00")
+    assert Decimal(s1["my_amount_offset"]) == Decimal("70000.00")
+
+    u = next(c for c in listed if c["id"] == unilateral_id)
+    assert u["contributor_name"] == "Usuario 1"
+
+    r = client.get("/contributions", headers=h2p)
+    assert r.status_code == 200, f"list u2: {r.text}"
+    s2 = next(c for c in r.json() if c["id"] == solicitud_id)
+    assert s2["i_paid"] is False
+    assert s2["my_payment_id"] == p2.id
+    assert Decimal(s2["my_amount_due"]) == Decimal("30000.00")
+
+
+# ---------------------------------------------------------------------------
+# Caso B: auto-aprobación al enviar el pago
+# ---------------------------------------------------------------------------
+
+def test_envio_de_pago_auto_aprobacion(client):
+    project_id, (u1_id, _, h1p), (u2_id, _, h2p) = setup_shared_project(client)
+
+    r = client.post("/contributions", json={
+        "description": "Solicitud simple",
+        "amount": "10000.00",
+        "currency": "ARS",
+    }, headers=h1p)
+    assert r.status_code == 201, f"create contribution: {r.text}"
+    payments = payments_by_user(r.json()["id"])
+
+    # Admin en proyecto compartido → auto-aprobado y acreditado
+    r = client.put(f"/contributions/payments/{payments[u1_id].id}/submit", json={
+        "amount_paid": "7000.00",
+        "currency_paid": "ARS",
+    }, headers=h1p)
+    assert r.status_code == 200, f"submit u1: {r.text}"
+    assert r.json()["is_paid"] is True
+    assert member_balance_ars(project_id, u1_id) == Decimal("7000.00")
+
+    # No admin en proyecto compartido → queda pendiente, sin acreditar
+    r = client.put(f"/contributions/payments/{payments[u2_id].id}/submit", json={
+        "amount_paid": "3000.00",
+        "currency_paid": "ARS",
+    }, headers=h2p)
+    assert r.status_code == 200, f"submit u2: {r.text}"
+    assert r.json()["is_paid"] is False
+    assert payments_by_user(payments[u2_id].contribution_id)[u2_id].is_pending_approval is True
+    assert member_balance_ars(project_id, u2_id) == Decimal("0")
+
+    # Pagar un pago ajeno → 403; pago inexistente → 404
+    r = client.put(f"/contributions/payments/{payments[u1_id].id}/submit", json={
+        "amount_paid": "1.00",
+        "currency_paid": "ARS",
+    }, headers=h2p)
+    assert r.status_code == 403
+    r = client.put("/contributions/payments/999999/submit", json={
+        "amount_paid": "1.00",
+        "currency_paid": "ARS",
+    }, headers=h2p)
+    assert r.status_code == 404
+
+    # Proyecto marcado como individual → el no admin también se auto-aprueba
+    set_is_individual(project_id, True)
+    r = client.post("/contributions", json={
+        "description": "Solicitud en proyecto individual",
+        "amount": "1000.00",
+        "currency": "ARS",
+    }, headers=h1p)
+    assert r.status_code == 201, f"create contribution: {r.text}"
+    u2_payment = payments_by_user(r.json()["id"])[u2_id]
+
+    r = client.put(f"/contributions/payments/{u2_payment.id}/submit", json={
+        "amount_paid": "300.00",
+        "currency_paid": "ARS",
+    }, headers=h2p)
+    assert r.status_code == 200, f"submit u2 individual: {r.text}"
+    assert r.json()["is_paid"] is True
+    assert member_balance_ars(project_id, u2_id) == Decimal("300.00")
+
+
+# ---------------------------------------------------------------------------
+# Caso C: acceso a comprobantes de solicitudes
+# ---------------------------------------------------------------------------
+
+def test_descarga_de_comprobante_solo_miembros(client):
+    project_id, (u1_id, h1, h1p), (u2_id, _, h2p) = setup_shared_project(client)
+    _, h3 = register_and_login(client, "u3@escenario04.com", "Usuario 3", admin_headers=h1)
+
+    r = client.post("/contributions", json={
+        "description": "Solicitud con comprobante",
+        "amount": "1000.00",
+        "currency": "ARS",
+    }, headers=h1p)
+    assert r.status_code == 201, f"create contribution: {r.text}"
+    u1_payment_id = payments_by_user(r.json()["id"])[u1_id].id
+
+    # Miembro del proyecto (no dueño del pago): pasa el control, aún no hay comprobante
+    r = client.get(f"/contributions/payments/{u1_payment_id}/receipt", headers=h2p)
+    assert r.status_code == 404
+    assert r.json()["detail"] == "No receipt found for this payment"
+
+    # Usuario que no pertenece al proyecto → 403
+    r = client.get(f"/contributions/payments/{u1_payment_id}/receipt", headers=h3)
+    assert r.status_code == 403
+
+    # Pago inexistente → 404
+    r = client.get("/contributions/payments/999999/receipt", headers=h2p)
+    assert r.status_code == 404
@@ -0,0 +1,170 @@
+"""
+Test E2E — Escenario 05: Listado y detalle de gastos
+
+Verifica el flujo descripto en:
+  tests/scenarios/05_listado_y_detalle_de_gastos.md
+
+Casos cubiertos:
+  A — Listado de una página completa (100 gastos): proveedor, categoría y
+      rubro de la categoría vienen en cada gasto, junto con los conteos de
+      pagos y los datos del usuario actual.
+  B — Detalle de un gasto: nombres de los participantes y totales pagados /
+      pendientes.
+
+Las consultas del listado y del detalle bloquean la carga perezosa de las
+relaciones del gasto (raiseload), así que serializar la respuesta completa
+también verifica que cada relación usada tiene su eager load.
+"""
+
+from decimal import Decimal
+
+from tests.e2e.test_04_solicitudes_absorcion_y_aprobacion import (
+    create_ars_project,
+    register_and_login,
+)
+
+
+EXPENSE_COUNT = 100
+PAID_EVERY = 10
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def setup_project_with_expenses(client):
+    """
+    Proyecto ARS: U1 admin 60%, U2 miembro 40%.
+    Crea 100 gastos alternando dos proveedores y dos categorías (cada una con
+    su rubro) y marca como pagado uno de cada diez.
+    """
+    u1_id, h1 = register_and_login(client, "u1@escenario05.com", "Usuario 1")
+    u2_id, h2 = register_and_login(client, "u2@escenario05.com", "Usuario 2", admin_headers=h1)
+
+    project_id = create_ars_project(client, h1, "Proyecto Escenario 05")
+    h1p = {**h1, "X-Project-ID": str(project_id)}
+    h2p = {**h2, "X-Project-ID": str(project_id)}
+
+    r = client.put(f"/projects/{project_id}/members/{u1_id}", json={
+        "participation_percentage": 60,
+    }, headers=h1p)
+    assert r.status_code == 200, f"update u1 percentage: {r.text}"
+
+    r = client.post(f"/projects/{project_id}/members", json={
+        "user_id": u2_id,
+        "participation_percentage": 40,
+    }, headers=h1p)
+    assert r.status_code == 200, f"add member: {r.text}"
+
+    catalog = []
+    for rubro_name, category_name, provider_name in (
+        ("Construcción", "Materiales", "Corralón Norte"),
+        ("Oficina", "Librería", "Papelera Sur"),
+    ):
+        r = client.post("/rubros", json={"name": rubro_name}, headers=h1p)
+        assert r.status_code == 201, f"create rubro: {r.text}"
+        r = client.post("/categories", json={
+            "name": category_name,
+            "rubro_id": r.json()["id"],
+        }, headers=h1p)
+        assert r.status_code == 201, f"create category: {r.text}"
+        category_id = r.json()["id"]
+        r = client.post("/providers", json={"name": provider_name}, headers=h1p)
+        assert r.status_code == 201, f"create provider: {r.text}"
+        catalog.append((r.json()["id"], category_id))
+
+    expense_ids = []
+    for i in range(EXPENSE_COUNT):
+        provider_id, category_id = catalog[i % 2]
+        r = client.post("/expenses", json={
+            "description": f"Gasto {i + 1:03d}",
+            "amount_original": "1000.00",
+            "currency_original": "ARS",
+            "provider_id": provider_id,
+            "category_id": category_id,
+        }, headers=h1p)
+        assert r.status_code == 201, f"create expense {i + 1}: {r.text}"
+        expense_ids.append(r.json()["id"])
+
+    for expense_id in expense_ids[::PAID_EVERY]:
+        r = client.post(f"/expenses/{expense_id}/mark-all-paid", json={}, headers=h1p)
+        assert r.status_code == 200, f"mark all paid: {r.text}"
+        assert r.json()["marked_count"] == 2
+
+    return expense_ids, (u1_id, h1p), (u2_id, h2p)
+
+
+# ---------------------------------------------------------------------------
+# Caso A: listado de una página completa
+# ---------------------------------------------------------------------------
+
+def test_listado_de_gastos_pagina_completa(client):
+    expense_ids, (_, h1p), (_, h2p) = setup_project_with_expenses(client)
+    paid_ids = set(expense_ids[::PAID_EVERY])
+
+    r = client.get("/expenses", params={"limit": EXPENSE_COUNT}, headers=h1p)
+    assert r.status_code == 200, f"list expenses: {r.text}"
+    listed = r.json()
+    assert sorted(e["id"] for e in listed) == sorted(expense_ids)
+
+    expected_names = {
+        "Corralón Norte": ("Materiales", "Construcción"),
+        "Papelera Sur": ("Librería", "Oficina"),
+    }
+    for e in listed:
+        category_name, rubro_name = expected_names[e["provider"]["name"]]
+        assert e["category"]["name"] == category_name
+        assert e["category"]["rubro"]["name"] == rubro_name
+        assert e["total_participants"] == 2
+        if e["id"] in paid_ids:
+            assert e["paid_participants"] == 2
+            assert e["is_complete"] is True
+            assert e["i_paid"] is True
+        else:
+            assert e["paid_participants"] == 0
+            assert e["is_complete"] is False
+            assert e["i_paid"] is False
+        assert Decimal(e["my_amount_due"]) == Decimal("0")
+
+    # El otro miembro ve la misma página con sus propios datos
+    r = client.get("/expenses", params={"limit": EXPENSE_COUNT}, headers=h2p)
+    assert r.status_code == 200, f"list expenses u2: {r.text}"
+    assert len(r.json()) == EXPENSE_COUNT
+    assert sum(1 for e in r.json() if e["i_paid"]) == len(paid_ids)
+
+
+# ---------------------------------------------------------------------------
+# Caso B: detalle de un gasto
+# ---------------------------------------------------------------------------
+
+def test_detalle_de_gasto(client):
+    expense_ids, (u1_id, h1p), (u2_id, h2p) = setup_project_with_expenses(client)
+
+    # Gasto pagado: ambos participantes pagaron su cuota en ARS
+    r = client.get(f"/expenses/{expense_ids[0]}", headers=h2p)
+    assert r.status_code == 200, f"get paid expense: {r.text}"
+    detail = r.json()
+    assert detail["provider"]["name"] == "Corralón Norte"
+    assert detail["category"]["rubro"]["name"] == "Construcción"
+    assert {p["user_id"]: p["user_name"] for p in detail["participant_payments"]} == {
+        u1_id: "Usuario 1",
+        u2_id: "Usuario 2",
+    }
+    assert {p["user_id"]: Decimal(p["amount_due_ars"]) for p in detail["participant_payments"]} == {
+        u1_id: Decimal("600.00"),
+        u2_id: Decimal("400.00"),
+    }
+    assert detail["is_complete"] is True
+    assert detail["i_paid"] is True
+    assert Decimal(detail["total_actual_paid_ars"]) == Decimal("1000.00")
+    assert detail["total_actual_paid_usd"] is None
+
+    # Gasto pendiente: nada pagado todavía
+    r = client.get(f"/expenses/{expense_ids[1]}", headers=h1p)
+    assert r.status_code == 200, f"get pending expense: {r.text}"
+    detail = r.json()
+    assert detail["provider"]["name"] == "Papelera Sur"
+    assert detail["category"]["rubro"]["name"] == "Oficina"
+    assert detail["paid_participants"] == 0
+    assert detail["is_pending_approval"] is False
+    assert detail["total_actual_paid_ars"] is None
@@ -0,0 +1,133 @@
+"""
+Test E2E — Escenario 06: Subida de facturas y comprobantes a Cloudinary
+
+Verifica el flujo descripto en:
+  tests/scenarios/06_subida_de_archivos_a_cloudinary.md
+
+Casos cubiertos:
+  A — Factura de un gasto: el archivo se sube completo a la carpeta de
+      facturas y la URL queda guardada en el gasto.
+  B — Comprobante de pago de un participante: idem en la carpeta de
+      comprobantes.
+
+Cloudinary no se llama de verdad: `cloudinary.uploader.upload_large` se
+reemplaza por un doble que, como la librería, lee el stream dentro de
+`with file_io:` (lo que cierra el archivo si nadie lo impide).
+"""
+
+import types
+
+import pytest
+
+from app.database import SessionLocal
+from app.models.expense import Expense
+from app.models.payment import ParticipantPayment
+from app.services import file_storage
+from tests.e2e.test_04_solicitudes_absorcion_y_aprobacion import setup_shared_project
+
+
+PDF_CONTENT = b"%PDF-1.4 escenario 06 " + b"x" * 4096
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def uploads(monkeypatch):
+    """Activa Cloudinary con un upload_large falso y devuelve las subidas hechas."""
+    calls = []
+
+    def fake_upload_large(file, **options):
+        file_io = file
+        with file_io:
+            file_io.seek(0, 2)
+            size = file_io.tell()
+            file_io.seek(0)
+            data = file_io.read()
+        assert len(data) == size
+        calls.append({"data": data, **options})
+        return {"secure_url": f"https://res.cloudinary.com/test/raw/upload/{options['public_id']}"}
+
+    fake_cloudinary = types.SimpleNamespace(
+        uploader=types.SimpleNamespace(upload_large=fake_upload_large),
+    )
+    monkeypatch.setattr(file_storage, "cloudinary", fake_cloudinary, raising=False)
+    monkeypatch.setattr(file_storage, "cloudinary_configured", True)
+    return calls
+
+
+def create_expense(client, headers):
+    r = client.post("/expenses", json={
+        "description": "Gasto con factura",
+        "amount_original": "1000.00",
+        "currency_original": "ARS",
+    }, headers=headers)
+    assert r.status_code == 201, f"create expense: {r.text}"
+    return r.json()["id"]
+
+
+# ---------------------------------------------------------------------------
+# Caso A: factura de un gasto
+# ---------------------------------------------------------------------------
+
+def test_subida_de_factura(client, uploads):
+    _, (_, _, h1p), _ = setup_shared_project(client)
+    expense_id = create_expense(client, h1p)
+
+    r = client.post(
+        f"/expenses/{expense_id}/invoice",
+        files={"file": ("factura.pdf", PDF_CONTENT, "application/pdf")},
+        headers=h1p,
+    )
+    assert r.status_code == 200, f"upload invoice: {r.text}"
+
+    assert len(uploads) == 1
+    assert uploads[0]["data"] == PDF_CONTENT
+    assert uploads[0]["folder"] == "construccion/invoices"
+    assert uploads[0]["public_id"].startswith(f"expense_{expense_id}_")
+    assert uploads[0]["public_id"].endswith(".pdf")
+
+    url = r.json()["file_path"]
+    assert url.endswith(uploads[0]["public_id"])
+    db = SessionLocal()
+    try:
+        assert db.get(Expense, expense_id).invoice_file_path == url
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Caso B: comprobante de pago de un participante
+# ---------------------------------------------------------------------------
+
+def test_subida_de_comprobante(client, uploads):
+    _, (_, _, h1p), (u2_id, _, h2p) = setup_shared_project(client)
+    expense_id = create_expense(client, h1p)
+
+    db = SessionLocal()
+    try:
+        payment_id = db.query(ParticipantPayment.id).filter(
+            ParticipantPayment.expense_id == expense_id,
+            ParticipantPayment.user_id == u2_id,
+        ).scalar()
+    finally:
+        db.close()
+
+    r = client.post(
+        f"/payments/{payment_id}/receipt",
+        files={"file": ("comprobante.pdf", PDF_CONTENT, "application/pdf")},
+        headers=h2p,
+    )
+    assert r.status_code == 200, f"upload receipt: {r.text}"
+
+    assert len(uploads) == 1
+    assert uploads[0]["data"] == PDF_CONTENT
+    assert uploads[0]["folder"] == "construccion/receipts"
+    assert uploads[0]["public_id"].startswith(f"payment_{payment_id}_")
+
+    db = SessionLocal()
+    try:
+        assert db.get(ParticipantPayment, payment_id).receipt_file_path == r.json()["file_path"]
+    finally:
+        db.close()